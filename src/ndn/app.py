@@ -502,19 +502,21 @@ class NDNApp:
     async def _on_data(self, name: FormalName, meta_info: MetaInfo,
                        content: Optional[BinaryStr], sig: SignaturePtrs, raw_packet):
         clean_list = []
-        for prefix, node in self._int_tree.prefixes(name):
-            if node.satisfy((name, meta_info, content, sig, raw_packet), prefix != name):
-                clean_list.append(prefix)
-        for prefix in clean_list:
-            del self._int_tree[prefix]
+        data = (name, meta_info, content, sig, raw_packet)
+        name_len = len(name)
+        for depth, node in self._int_tree.iter_prefixes_with_values(name):
+            if node.satisfy(data, depth != name_len):
+                clean_list.append(depth)
+        for depth in clean_list:
+            del self._int_tree[name[:depth]]
 
     async def _on_interest(self, name: FormalName, param: InterestParam,
                            app_param: Optional[BinaryStr], sig: SignaturePtrs, raw_packet: BinaryStr):
-        trie_step = self._prefix_tree.longest_prefix(name)
-        if not trie_step:
+        trie_item = self._prefix_tree.longest_prefix_item(name)
+        if trie_item is None:
             self.logger.warning('No route: %s' % name)
             return
-        node = trie_step.value
+        node = trie_item[1]
         if node.callback is None:
             self.logger.warning('No callback: %s' % name)
             return
@@ -523,7 +525,9 @@ class NDNApp:
                 self.logger.warning('Drop malformed Interest: %s' % name)
                 return
 
-        # In case the validator blocks the pipeline, create a task
+        # In case the validator blocks the pipeline, create a task.
+        # The callback is called with the same name object the validator got, with no await in between.
+        # Callbacks may rely on this, e.g. the schema tree reuses the match made by its validator.
         async def submit_interest():
             if sig.signature_info is not None:
                 validator = node.validator if node.validator else self.int_validator
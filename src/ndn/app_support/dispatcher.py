@@ -60,8 +60,8 @@ class Dispatcher:
 
         :return: ``True`` if the Interest is dispatched to some callbacks.
         """
-        trie_step = self._tree.longest_prefix(name)
-        if not trie_step:
+        trie_item = self._tree.longest_prefix_item(name)
+        if trie_item is None:
             return False
-        trie_step.value.callback(name, param, app_param)
+        trie_item[1].callback(name, param, app_param)
         return True
@@ -103,7 +103,7 @@ class PrefixTreeNode:
     validator: typing.Optional[Validator] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PendingIntEntry:
     future: aio.Future
     deadline: int
@@ -152,17 +152,28 @@ class InterestTreeNode:
             PendingIntEntry(future, deadline, param.can_be_prefix, param.must_be_fresh, validator, implicit_sha256))
 
     def nack_interest(self, nack_reason: int) -> bool:
+        exc = types.InterestNack(nack_reason)
         for entry in self.pending_list:
-            entry.future.set_exception(types.InterestNack(nack_reason))
+            future = entry.future
+            # A future may have been cancelled by the caller in the meantime
+            if not future.done():
+                future.set_exception(exc)
         return True
 
     def satisfy(self, data: types.DataTuple, is_prefix: bool) -> bool:
-        unsatisfied_entries = []
+        if is_prefix and self.pending_list and not any(e.can_be_prefix for e in self.pending_list):
+            # Only CanBePrefix Interests can be satisfied by a longer Data name
+            return False
+        # Most Data packets satisfy every entry, so only allocate a new list when needed
+        unsatisfied_entries = None
         raw_packet = data[4]
+        data_sha256 = None
         for entry in self.pending_list:
             if entry.can_be_prefix or not is_prefix:
                 if len(entry.implicit_sha256) > 0:
-                    data_sha256 = sha256(raw_packet).digest()
+                    # Compute the digest at most once per Data packet
+                    if data_sha256 is None:
+                        data_sha256 = sha256(raw_packet).digest()
                     passed = data_sha256 == entry.implicit_sha256
                 else:
                     passed = True
@@ -171,9 +182,11 @@ class InterestTreeNode:
             if passed:
                 # Try to validate the packet
                 aio.create_task(entry.satisfy(data))
+            elif unsatisfied_entries is None:
+                unsatisfied_entries = [entry]
             else:
                 unsatisfied_entries.append(entry)
-        if unsatisfied_entries:
+        if unsatisfied_entries is not None:
             self.pending_list = unsatisfied_entries
             return False
         else:
@@ -181,11 +194,14 @@ class InterestTreeNode:
 
     def timeout(self, future: aio.Future):
         # Exception is raised by outside code.
+        remaining = []
         for ele in self.pending_list:
-            if ele.future is future and ele.task is not None:
+            if ele.future is not future:
+                remaining.append(ele)
+            elif ele.task is not None:
                 ele.task.cancel()
-        self.pending_list = [ele for ele in self.pending_list if ele.future is not future]
-        return not self.pending_list
+        self.pending_list = remaining
+        return not remaining
 
     def cancel(self):
         for entry in self.pending_list:
@@ -328,11 +344,11 @@ class NDNApp:
     async def _on_interest(self, name: enc.FormalName, pit_token: typing.Optional[enc.BinaryStr],
                            param: enc.InterestParam, app_param: typing.Optional[enc.BinaryStr], sig: enc.SignaturePtrs,
                            raw_packet: enc.BinaryStr):
-        trie_step = self._fib.longest_prefix(name)
-        if not trie_step:
+        trie_item = self._fib.longest_prefix_item(name)
+        if trie_item is None:
             self.logger.warning('No route: %s' % name)
             return
-        node: PrefixTreeNode = trie_step.value
+        node: PrefixTreeNode = trie_item[1]
         if node.callback is None:
             self.logger.warning('No callback: %s' % name)
             return
@@ -578,11 +594,13 @@ class NDNApp:
                        content: typing.Optional[enc.BinaryStr], sig: enc.SignaturePtrs,
                        raw_packet: enc.BinaryStr):
         clean_list = []
-        for prefix, node in self._pit.prefixes(name):
-            if node.satisfy((name, meta_info, content, sig, raw_packet), prefix != name):
-                clean_list.append(prefix)
-        for prefix in clean_list:
-            del self._pit[prefix]
+        data = (name, meta_info, content, sig, raw_packet)
+        name_len = len(name)
+        for depth, node in self._pit.iter_prefixes_with_values(name):
+            if node.satisfy(data, depth != name_len):
+                clean_list.append(depth)
+        for depth in clean_list:
+            del self._pit[name[:depth]]
 
     def _on_nack(self, name: enc.FormalName, nack_reason: int):
         try:
@@ -241,9 +241,11 @@ class MetaInfo(TlvModel):
 
     @staticmethod
     def from_dict(kwargs):
-        return MetaInfo(**{f.name: kwargs[f.name]
-                           for f in MetaInfo._encoded_fields
-                           if f.name in kwargs})
+        return MetaInfo(**{k: v for k, v in kwargs.items() if k in _META_INFO_FIELD_NAMES})
+
+
+# Computed once: from_dict is called for every Data packet produced by the schema tree
+_META_INFO_FIELD_NAMES = frozenset(f.name for f in MetaInfo._encoded_fields)
 
 
 class DataPacketValue(TlvModel):
@@ -332,9 +334,11 @@ class InterestParam:
 
     @staticmethod
     def from_dict(kwargs):
-        return InterestParam(**{f.name: kwargs[f.name]
-                                for f in dc.fields(InterestParam)
-                                if f.name in kwargs})
+        return InterestParam(**{k: v for k, v in kwargs.items() if k in _INTEREST_PARAM_FIELD_NAMES})
+
+
+# Computed once: from_dict is called for every Interest expressed by the schema tree
+_INTEREST_PARAM_FIELD_NAMES = frozenset(f.name for f in dc.fields(InterestParam))
 
 
 @dc.dataclass
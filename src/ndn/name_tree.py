@@ -18,14 +18,47 @@
 import asyncio as aio
 import dataclasses as dc
 from hashlib import sha256
-from typing import Optional
+from typing import Any, Iterator, Optional
 from pygtrie import Trie
 from .encoding import InterestParam, FormalName, BinaryStr
 from .types import InterestNack, Validator, Route, DataTuple
 
 
+def _check_node_internals():
+    """
+    Check that pygtrie's private node structure is the one the fast lookups of :class:`NameTrie` walk,
+    i.e. ``Trie._root`` is a node with a ``value`` and ``children.get(step)``.
+
+    :return: the sentinel pygtrie uses for nodes without a value, or ``None`` if the structure differs.
+    """
+    try:
+        from pygtrie import _Node
+        # The sentinel's name differs across pygtrie versions
+        no_value = _Node().value
+        trie = Trie()
+        trie[['a']] = 1
+        root = trie._root
+        if root.value is no_value and root.children.get('a').value == 1 and root.children.get('b') is None:
+            return no_value
+    except (ImportError, AttributeError, TypeError):
+        pass
+    return None
+
+
+# Sentinel for nodes without a value. None if pygtrie's internals changed, and the public API is used instead.
+_NO_VALUE = _check_node_internals()
+
+
 class NameTrie(Trie):
     def _path_from_key(self, key: FormalName) -> FormalName:
+        # Names are usually uniform: bytes, bytearray from Name.from_str, or memoryview from decoding.
+        # Dispatch on the first component so the uniform cases run through C-level loops.
+        if key:
+            typ = type(key[0])
+            if typ is bytes and all(type(x) is bytes for x in key):
+                return key if isinstance(key, list) else list(key)
+            if typ is bytearray:
+                return list(map(bytes, key))
         # bytes(x) will copy x if x is memoryview or bytearray but will not copy bytes
         return [x if isinstance(x, memoryview) and x.readonly else bytes(x)
                 for x in key]
@@ -33,8 +66,56 @@ class NameTrie(Trie):
     def _key_from_path(self, path: FormalName) -> FormalName:
         return path
 
+    def iter_prefixes_with_values(self, key: FormalName) -> Iterator[tuple[int, Any]]:
+        """
+        Walk towards a name and yield every prefix that has a value, shortest first.
+
+        This is a single descent that yields the depth instead of the prefix itself,
+        so no intermediate key is built unless the caller slices ``key[:depth]``.
 
-@dc.dataclass
+        :param key: the name to look up.
+        :return: an iterator of ``(depth, value)``.
+        """
+        if _NO_VALUE is None:
+            for step in self.prefixes(key):
+                yield len(step.key), step.value
+            return
+        node = self._root
+        if node.value is not _NO_VALUE:
+            yield 0, node.value
+        for depth, step in enumerate(self._path_from_key(key), 1):
+            node = node.children.get(step)
+            if node is None:
+                return
+            if node.value is not _NO_VALUE:
+                yield depth, node.value
+
+    def longest_prefix_item(self, key: FormalName) -> Optional[tuple[int, Any]]:
+        """
+        Find the longest prefix of a name that has a value.
+
+        Unlike :meth:`longest_prefix`, this descends the trie once without constructing
+        intermediate steps and traces, so it is cheap enough for per-packet FIB lookups.
+
+        :param key: the name to look up.
+        :return: ``(depth, value)``, where ``key[:depth]`` is the matched prefix,
+            or ``None`` if no prefix of ``key`` has a value.
+        """
+        if _NO_VALUE is None:
+            step = self.longest_prefix(key)
+            return (len(step.key), step.value) if step else None
+        node = self._root
+        ret = None if node.value is _NO_VALUE else (0, node.value)
+        for depth, step in enumerate(self._path_from_key(key), 1):
+            node = node.children.get(step)
+            if node is None:
+                break
+            if node.value is not _NO_VALUE:
+                ret = (depth, node.value)
+        return ret
+
+
+@dc.dataclass(slots=True)
 class PendingIntEntry:
     future: aio.Future
     lifetime: int
@@ -55,27 +136,42 @@ class InterestTreeNode:
                             param.can_be_prefix, param.must_be_fresh, implicit_sha256))
 
     def nack_interest(self, nack_reason: int) -> bool:
+        exc = InterestNack(nack_reason)
         for entry in self.pending_list:
-            entry.future.set_exception(InterestNack(nack_reason))
+            future = entry.future
+            # A future may have been cancelled by the caller in the meantime
+            if not future.done():
+                future.set_exception(exc)
         return True
 
     def satisfy(self, data: DataTuple, is_prefix: bool) -> bool:
-        unsatisfied_entries = []
+        if is_prefix and self.pending_list and not any(e.can_be_prefix for e in self.pending_list):
+            # Only CanBePrefix Interests can be satisfied by a longer Data name
+            return False
+        # Most Data packets satisfy every entry, so only allocate a new list when needed
+        unsatisfied_entries = None
         raw_packet = data[4]
+        data_sha256 = None
         for entry in self.pending_list:
             if entry.can_be_prefix or not is_prefix:
                 if len(entry.implicit_sha256) > 0:
-                    data_sha256 = sha256(raw_packet).digest()
+                    # Compute the digest at most once per Data packet
+                    if data_sha256 is None:
+                        data_sha256 = sha256(raw_packet).digest()
                     passed = data_sha256 == entry.implicit_sha256
                 else:
                     passed = True
             else:
                 passed = False
             if passed:
-                entry.future.set_result(data)
+                future = entry.future
+                if not future.done():
+                    future.set_result(data)
+            elif unsatisfied_entries is None:
+                unsatisfied_entries = [entry]
             else:
                 unsatisfied_entries.append(entry)
-        if unsatisfied_entries:
+        if unsatisfied_entries is not None:
             self.pending_list = unsatisfied_entries
             return False
         else:
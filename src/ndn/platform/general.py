@@ -17,13 +17,14 @@
 # -----------------------------------------------------------------------------
 import abc
 import sys
-from typing import List
+from typing import List, Optional
 
 __all__ = ['Platform']
 
 
 class Platform(abc.ABC):
     _instance = None
+    _default_transport: Optional[str] = None
 
     def __new__(cls):
         if Platform._instance is None:
@@ -45,8 +46,20 @@ class Platform(abc.ABC):
     def client_conf_paths(self) -> List[str]:
         pass
 
-    @abc.abstractmethod
     def default_transport(self) -> str:
+        # The probe stats the file system, and its answer does not change while NFD is running
+        if self._default_transport is None:
+            self._default_transport = self._probe_default_transport()
+        return self._default_transport
+
+    def invalidate_cache(self):
+        """
+        Drop cached probing results, e.g. after NFD is restarted with a different socket path.
+        """
+        self._default_transport = None
+
+    @abc.abstractmethod
+    def _probe_default_transport(self) -> str:
         pass
 
     @abc.abstractmethod
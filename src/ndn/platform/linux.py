@@ -27,7 +27,7 @@ class Linux(Platform):
                 '/opt/local/etc/ndn/client.conf',
                 '/etc/ndn/client.conf']
 
-    def default_transport(self):
+    def _probe_default_transport(self):
         if not os.path.exists('/run/nfd/nfd.sock') and os.path.exists('/run/nfd.sock'):
             # Try to be compatible to old NFD
             return 'unix:///run/nfd.sock'
@@ -27,6 +27,17 @@ if sys.platform == 'darwin':
 class OsxSec(object):
     __instance = None
 
+    # Security framework constants, resolved from the library on first access
+    _attr_names = frozenset([
+        "kSecClass", "kSecClassKey", "kSecAttrLabel", "kSecAttrKeyClass", "kSecAttrKeyClassPrivate",
+        "kSecReturnRef", "kSecReturnAttributes", "kSecValueRef", "kSecAttrKeyType",
+        "kSecAttrKeySizeInBits", "kSecAttrKeyTypeRSA", "kSecAttrKeyTypeECSECPrimeRandom",
+        "kSecKeyAlgorithmRSASignatureDigestPKCS1v15SHA256",
+        "kSecKeyAlgorithmECDSASignatureDigestX962SHA256", "kSecAttrTokenID",
+        "kSecAttrTokenIDSecureEnclave", "kSecPrivateKeyAttrs", "kSecAttrIsPermanent",
+        "kSecAttrAccessControl", "kSecAttrAccess", "kSecAttrAccessibleAfterFirstUnlock",
+        "kSecAttrApplicationTag"])
+
     def __new__(cls):
         if OsxSec.__instance is None:
             OsxSec.__instance = object.__new__(cls)
@@ -58,17 +69,6 @@ class OsxSec(object):
                   c_int32,
                   [c_void_p, c_void_p, c_void_p, c_uint16, POINTER(c_void_p)])
 
-        attr_list = ["kSecClass", "kSecClassKey", "kSecAttrLabel", "kSecAttrKeyClass", "kSecAttrKeyClassPrivate",
-                     "kSecReturnRef", "kSecReturnAttributes", "kSecValueRef", "kSecAttrKeyType",
-                     "kSecAttrKeySizeInBits", "kSecValueRef", "kSecAttrKeyType", "kSecAttrKeySizeInBits",
-                     "kSecAttrKeyTypeRSA", "kSecAttrKeyTypeECSECPrimeRandom",
-                     "kSecKeyAlgorithmRSASignatureDigestPKCS1v15SHA256",
-                     "kSecKeyAlgorithmECDSASignatureDigestX962SHA256", "kSecAttrTokenID",
-                     "kSecAttrTokenIDSecureEnclave", "kSecPrivateKeyAttrs", "kSecAttrIsPermanent",
-                     "kSecAttrAccessControl", "kSecAttrAccess", "kSecAttrAccessibleAfterFirstUnlock",
-                     "kSecAttrApplicationTag"]
-        for attr in attr_list:
-            setattr(self, attr, c_void_p.in_dll(self.security, attr))
         self.kSecAccessControlPrivateKeyUsage = 1 << 30
 
         cf.CFRetain.restype = c_void_p
@@ -79,6 +79,14 @@ class OsxSec(object):
         self.errSecSuccess = 0
         self.errSecItemNotFound = -25300
 
+    def __getattr__(self, name):
+        # Only called when the attribute is not set yet
+        if name in OsxSec._attr_names:
+            value = c_void_p.in_dll(self.security, name)
+            setattr(self, name, value)
+            return value
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
     @staticmethod
     def create_data(data: bytes) -> c_void_p:
         return cf.CFDataCreate(None, data, len(data))
@@ -120,7 +128,7 @@ class Darwin(Platform):
                 '/opt/local/etc/ndn/client.conf',
                 '/etc/ndn/client.conf']
 
-    def default_transport(self):
+    def _probe_default_transport(self):
         if not os.path.exists('/var/run/nfd/nfd.sock') and os.path.exists('/var/run/nfd.sock'):
             # Try to be compatible to old NFD
             return 'unix:///var/run/nfd.sock'
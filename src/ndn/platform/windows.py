@@ -16,6 +16,7 @@
 # limitations under the License.
 # -----------------------------------------------------------------------------
 import os
+import sys
 import aenum
 import socket
 import asyncio as aio
@@ -31,6 +32,13 @@ aenum.extend_enum(socket.AddressFamily, "AF_UNIX", 1)
 AF_UNIX = socket.AddressFamily(1)
 NULL = 0
 
+if sys.platform == 'win32':
+    # Declare the prototype once so ctypes does not infer argument types on every call.
+    # A private handle is used, since the function pointers of c.windll are shared by the whole process.
+    _ws2_32 = c.WinDLL('ws2_32', use_last_error=True)
+    _ws2_32.connect.argtypes = [c.c_size_t, c.POINTER(SockaddrUn), c.c_int]
+    _ws2_32.connect.restype = c.c_int
+
 
 class Cng:
     __instance = None
@@ -66,20 +74,25 @@ class Cng:
             Cng.__instance = object.__new__(cls)
         return Cng.__instance
 
-    def __init__(self):
-        if len(self.__dict__) > 0:
-            return
-        self.bcrypt = c.windll.bcrypt
-        self.ncrypt = c.windll.ncrypt
+    def __getattr__(self, name):
+        # Load bcrypt.dll and ncrypt.dll on first use only
+        if name in ('bcrypt', 'ncrypt'):
+            value = getattr(c.windll, name)
+            setattr(self, name, value)
+            return value
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
 
 
 class Win32(Platform):
+    # Encoded socket addresses, keyed by path. Faces usually reconnect to the same few paths.
+    _sockaddr_cache: dict[str, SockaddrUn] = {}
+
     def client_conf_paths(self):
         return [os.path.expandvars(r'%LOCALAPPDATA%\ndn\client.conf'),
                 os.path.expandvars(r'%USERPROFILE%\ndn\client.conf'),
                 os.path.expandvars(r'%ALLUSERSPROFILE%\ndn\client.conf')]
 
-    def default_transport(self):
+    def _probe_default_transport(self):
         # Note: %TEMP% won't be redirected even when the executable is a MSIX/MicrosoftStore app
         oldPath = os.path.expandvars(r'%TEMP%\nfd.sock')
         newPath = os.path.expandvars(r'%TEMP%\nfd\nfd.sock')
@@ -105,9 +118,11 @@ class Win32(Platform):
     @staticmethod
     def _iocp_connect(proactor, conn, address):
         # _overlapped.WSAConnect(conn.fileno(), address)
-        addr = SockaddrUn(AF_UNIX.value, address.encode() + b"\0")
-        winsock = c.windll.ws2_32
-        winsock.connect(conn.fileno(), addr, 110)
+        addr = Win32._sockaddr_cache.get(address)
+        if addr is None:
+            addr = SockaddrUn(AF_UNIX.value, address.encode() + b"\0")
+            Win32._sockaddr_cache[address] = addr
+        _ws2_32.connect(conn.fileno(), c.byref(addr), c.sizeof(SockaddrUn))
 
         fut = proactor._loop.create_future()
         fut.set_result(None)
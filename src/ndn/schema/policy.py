@@ -15,25 +15,68 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # -----------------------------------------------------------------------------
+from __future__ import annotations
 import abc
-from typing import Optional
+import asyncio as aio
+from typing import TYPE_CHECKING, Any, Optional
 from ..encoding import SignaturePtrs, FormalName, InterestParam, BinaryStr
-from ..encoding.signer import Signer
-from ..types import Validator
+if TYPE_CHECKING:
+    from ..encoding.signer import Signer
+    from ..types import Validator
 
 
 class Policy:
     """
     Policy is an annotation attached to a node.
     """
+    __slots__ = ('node',)
+
+    # Policy types do not use abc.ABCMeta, whose isinstance() checks are slower than plain classes'
+    # and the schema tree does several of them per packet.
+    # Methods decorated with abc.abstractmethod are still enforced on instantiation.
+    _abstract_methods = frozenset()
+    # Optional synchronous variant -> the coroutine method it stands for
+    _sync_variants = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._abstract_methods = frozenset(name for name in dir(cls)
+                                          if getattr(getattr(cls, name, None), '__isabstractmethod__', False))
+        # A subclass overriding only the coroutine method must not be bypassed by an inherited sync variant
+        sync_variants = {}
+        for base in cls.__mro__:
+            sync_variants.update(base.__dict__.get('_sync_variants', {}))
+        for sync_name, async_name in sync_variants.items():
+            sync_owner = next(c for c in cls.__mro__ if sync_name in c.__dict__)
+            async_owner = next(c for c in cls.__mro__ if async_name in c.__dict__)
+            if async_owner is not sync_owner and issubclass(async_owner, sync_owner):
+                setattr(cls, sync_name, None)
+
+    def __new__(cls, *args, **kwargs):
+        if cls._abstract_methods:
+            raise TypeError(f"Can't instantiate abstract class {cls.__name__} with abstract methods "
+                            f"{', '.join(sorted(cls._abstract_methods))}")
+        return super().__new__(cls)
+
     def __init__(self):
         self.node = None
 
 
-class Cache(Policy, metaclass=abc.ABCMeta):
+class Cache(Policy):
     """
     Cache policy determines how Data packets are stored.
+
+    A cache that never awaits may also implement ``search_sync`` and ``save_sync``
+    with the same arguments. When they are set, the schema tree calls them directly,
+    without creating a coroutine for every packet.
+    A subclass overriding only :meth:`search` or :meth:`save` has the inherited variant unset,
+    so the override is always called.
     """
+    __slots__ = ()
+    _sync_variants = {'search_sync': 'search', 'save_sync': 'save'}
+    search_sync = None
+    save_sync = None
+
     @abc.abstractmethod
     async def search(self, match, name: FormalName, param: InterestParam):
         pass
@@ -43,57 +86,94 @@ class Cache(Policy, metaclass=abc.ABCMeta):
         pass
 
 
-class InterestValidator(Policy, metaclass=abc.ABCMeta):
+class InterestValidator(Policy):
     """
     InterestValidator policy describes how to verify an Interest packet.
+
+    A validator that never awaits may also implement ``validate_sync``,
+    which the schema tree prefers over :meth:`validate` when it is set.
     """
+    __slots__ = ()
+    _sync_variants = {'validate_sync': 'validate'}
+    validate_sync = None
+
     @abc.abstractmethod
     async def validate(self, match, sig_ptrs: SignaturePtrs) -> bool:
         pass
 
+    async def validate_batch(self, items: list[tuple[Any, SignaturePtrs]]) -> list[bool]:
+        """
+        Validate several Interest packets at once.
+        By default, the packets are validated concurrently, so fetching keys for different packets overlaps.
+        A validator backed by a crypto library supporting batch verification can override this function.
+
+        :param items: a list of ``(match, sig_ptrs)`` pairs, one per packet.
+        :return: the validation results, in the same order as ``items``.
+        """
+        if self.validate_sync is not None:
+            return [self.validate_sync(match, sig_ptrs) for match, sig_ptrs in items]
+        return list(await aio.gather(*(self.validate(match, sig_ptrs) for match, sig_ptrs in items)))
 
-class DataValidator(Policy, metaclass=abc.ABCMeta):
+
+class DataValidator(Policy):
     """
     DataValidator policy describes how to verify a Data packet.
     """
+    __slots__ = ()
+
     @abc.abstractmethod
     def get_validator(self, match) -> Validator:
         pass
 
 
-class Signing(Policy, metaclass=abc.ABCMeta):
+class Signing(Policy):
     """
     Signing policy gives a signer used to sign a packet.
     When a user uses signing policy, he needs to specify whether its
     :class:`InterestSigning` or :class:`DataSigning`.
+
+    A signing policy may also implement ``get_signer_sync``,
+    which the schema tree prefers over :meth:`get_signer` when it is set.
     """
+    __slots__ = ()
+    _sync_variants = {'get_signer_sync': 'get_signer'}
+    get_signer_sync = None
+
     @abc.abstractmethod
     async def get_signer(self, match) -> Signer:
         pass
 
 
-class InterestSigning(Signing, metaclass=abc.ABCMeta):
+class InterestSigning(Signing):
     """
     InterestSigning policy is a type used to indicate the Interest signer.
     Used as the type argument of set_policy.
     """
-    pass
+    __slots__ = ()
 
 
-class DataSigning(Signing, metaclass=abc.ABCMeta):
+class DataSigning(Signing):
     """
     DataSigning policy is a type used to indicate the Data signer.
     Used as the type argument of set_policy.
     """
-    pass
+    __slots__ = ()
 
 
-class Encryption(Policy, metaclass=abc.ABCMeta):
+class Encryption(Policy):
     """
     Encryption policy encrypts and decrypts content.
     When a user uses encryption policy, he needs to specify whether its
     :class:`InterestEncryption` or :class:`DataEncryption`.
+
+    An encryption policy that never awaits may also implement ``decrypt_sync`` and ``encrypt_sync``,
+    which the schema tree prefers over :meth:`decrypt` and :meth:`encrypt` when they are set.
     """
+    __slots__ = ()
+    _sync_variants = {'decrypt_sync': 'decrypt', 'encrypt_sync': 'encrypt'}
+    decrypt_sync = None
+    encrypt_sync = None
+
     @abc.abstractmethod
     async def decrypt(self, match, content: BinaryStr) -> Optional[BinaryStr]:
         pass
@@ -103,20 +183,20 @@ class Encryption(Policy, metaclass=abc.ABCMeta):
         pass
 
 
-class InterestEncryption(Encryption, metaclass=abc.ABCMeta):
+class InterestEncryption(Encryption):
     """
     InterestSigning policy is a type used to indicate the Interest encryption policy.
     Used as the type argument of set_policy.
     """
-    pass
+    __slots__ = ()
 
 
-class DataEncryption(Encryption, metaclass=abc.ABCMeta):
+class DataEncryption(Encryption):
     """
     DataEncryption policy is a type used to indicate the Data encryption policy.
     Used as the type argument of set_policy.
     """
-    pass
+    __slots__ = ()
 
 
 class LocalOnly(Policy):
@@ -124,11 +204,11 @@ class LocalOnly(Policy):
     LocalOnly means the Data should be stored in the local storage.
     It prevents the node from sending Interest packets.
     """
-    pass
+    __slots__ = ()
 
 
 class Register(Policy):
     """
     Register policy indicates the node should be registered as a prefix in the forwarder.
     """
-    pass
+    __slots__ = ()
@@ -16,8 +16,12 @@
 # limitations under the License.
 # -----------------------------------------------------------------------------
 import asyncio as aio
-from typing import Dict, Any, Type, Optional
+import functools
+import inspect
+import logging
+from typing import Dict, Any, Mapping, Type, Optional
 from dataclasses import dataclass
+from types import MappingProxyType
 from ..encoding import is_binary_str, FormalName, NonStrictName, Name, Component, \
     SignaturePtrs, InterestParam, BinaryStr, MetaInfo, parse_data, TypeNumber
 from ..app import NDNApp
@@ -27,6 +31,44 @@ from .util import norm_pattern
 from . import policy
 
 
+def _background_task_done(tasks: set, task: aio.Task):
+    tasks.discard(task)
+    # Nobody awaits the task, so report its failure here instead of leaving it unretrieved
+    if not task.cancelled() and task.exception() is not None:
+        logging.getLogger(__name__).error('Background cache save failed', exc_info=task.exception())
+
+
+class _SharedFetch:
+    """
+    An Interest in flight that concurrent ``express`` calls for the same cached name wait on together.
+    The fetch is cancelled when the last waiter leaves.
+    """
+    __slots__ = ('task', 'param', 'waiters')
+
+    def __init__(self, task: aio.Task, param: InterestParam):
+        self.task = task
+        self.param = param
+        self.waiters = 0
+
+    def can_join(self, param: InterestParam) -> bool:
+        # The name, CanBePrefix and MustBeFresh are in the key; the other fields must agree as well,
+        # or a caller could wait far beyond its own lifetime
+        return (param.lifetime == self.param.lifetime and param.hop_limit == self.param.hop_limit
+                and param.forwarding_hint == self.param.forwarding_hint)
+
+    async def wait(self, pending: dict, key):
+        self.waiters += 1
+        try:
+            # The shield keeps the fetch running while other callers still wait on it
+            return await aio.shield(self.task)
+        finally:
+            self.waiters -= 1
+            if self.waiters == 0 and not self.task.done():
+                if pending.get(key, None) is self:
+                    del pending[key]
+                self.task.cancel()
+
+
 class NodeExistsError(Exception):
     """
     Raised when trying to create a node which already exists.
@@ -63,10 +105,24 @@ class Node:
     prefix: FormalName
     app: Optional[NDNApp]
 
+    # Bumped whenever a policy is set or the tree changes, which invalidates every node's merged policies
+    _tree_version = 0
+    _merged_version = -1
+    _merged_policies = None
+    # The last Interest validated by _int_validator and its match. Only used at the root.
+    _last_validated = None
+    # Strong references to fire-and-forget tasks, which the event loop only keeps weakly.
+    # Only used at the root, and created on first use.
+    _background_tasks = None
+    # In-flight Interests for cached names, keyed by name and selectors.
+    # Only used at the root, and created on first use.
+    _pending_fetches = None
+
     def __init__(self, parent=None):
         self.parent = parent
         # Efficiency is not considered at this draft
         self.children = {}
+        # Pattern children, keyed by the TLV type of the component they match: type -> (variable name, node)
         self.matches = {}
         self.policies = {}
         self.prefix = []
@@ -89,19 +145,21 @@ class Node:
         if is_binary_str(key):
             return bytes(key) in self.children
         else:
-            return key[:2] in self.matches
+            return key[1] in self.matches
 
     def _get(self, key):
         if is_binary_str(key):
             return self.children[bytes(key)]
         else:
-            return self.matches[key[:2]][1]
+            return self.matches[key[1]][1]
 
     def _set(self, key, val):
+        Node._tree_version += 1
+        val.parent = self
         if is_binary_str(key):
             self.children[bytes(key)] = val
         else:
-            self.matches[key[:2]] = (key[2], val)
+            self.matches[key[1]] = (key[2], val)
         return val
 
     def __getitem__(self, key: str):
@@ -140,21 +198,39 @@ class Node:
         if cur.exist(key_lst[-1]):
             raise NodeExistsError(key)
         cur._set(key_lst[-1], value)
-        value.parent = cur
         return value
 
-    def _match_step(self, comp: bytes, env, policies):
-        policies.update(self.policies)
-        chd = self.children.get(comp, None)
-        if chd is not None:
-            return chd
-        typ = Component.get_type(comp)
-        match = self.matches.get((0, typ), None)
-        if match is not None:
-            env[match[0]] = Component.get_value(comp)
-            return match[1]
-        else:
-            return None
+    def _walk(self, name: FormalName, pos: int, env):
+        # Follow the name from this node as far as possible, starting from the component at pos.
+        # Pattern variables are assigned into env. Return the node reached and the position where it stops.
+        # The whole walk is one loop, since a method call per component costs more than the lookups.
+        cur = self
+        name_len = len(name)
+        while pos < name_len:
+            comp = name[pos]
+            if type(comp) is not bytes:
+                # Children are keyed by bytes, which memoryview and bytearray components do not hash like
+                comp = bytes(comp)
+            nxt = cur.children.get(comp, None)
+            if nxt is None:
+                # Most nodes have no pattern children, and then the walk ends here
+                if not cur.matches:
+                    break
+                # Types and lengths below 253 are encoded in a single byte
+                typ = comp[0]
+                if typ >= 253:
+                    typ = Component.get_type(comp)
+                pattern = cur.matches.get(typ, None)
+                if pattern is None:
+                    break
+                if typ < 253 and comp[1] < 253:
+                    env[pattern[0]] = memoryview(comp)[2:]
+                else:
+                    env[pattern[0]] = Component.get_value(comp)
+                nxt = pattern[1]
+            cur = nxt
+            pos += 1
+        return cur, pos
 
     def match(self, name: NonStrictName):
         """
@@ -167,8 +243,6 @@ class Node:
         if self.parent is not None:
             raise ValueError('Node.match() should be called from root')
         env = {}
-        policies = {}
-        cur = self
         name = Name.normalize(name)
         if self.prefix:
             if len(name) < len(self.prefix) or name[:len(self.prefix)] != self.prefix:
@@ -177,17 +251,8 @@ class Node:
             pos = len(self.prefix)
         else:
             pos = 0
-        while pos < len(name):
-            nxt = cur._match_step(bytes(name[pos]), env, policies)
-            if not nxt:
-                break
-            else:
-                cur = nxt
-                pos += 1
-        if pos is None:
-            pos = len(name)
-        policies.update(cur.policies)
-        return MatchedNode(root=self, node=cur, name=name, pos=pos, env=env, policies=policies)
+        cur, pos = self._walk(name, pos, env)
+        return MatchedNode(root=self, node=cur, name=name, pos=pos, env=env, policies=cur._get_merged_policies())
 
     # TODO: Apply
 
@@ -201,12 +266,18 @@ class Node:
         :param typ: a policy type
         :return: the policy. None if there does not exist one.
         """
-        ret = None
-        cur = self
-        while ret is None and cur is not None:
-            ret = cur.policies.get(typ, None)
-            cur = cur.parent
-        return ret
+        return self._get_merged_policies().get(typ, None)
+
+    def _get_merged_policies(self):
+        # The policies applying to a node only depend on its path from the root,
+        # so they are merged once and reused until the tree or any policy changes.
+        # The result is shared by all MatchedNodes of this node, so it is a read-only view.
+        if self._merged_version != Node._tree_version:
+            merged = dict(self.parent._get_merged_policies()) if self.parent is not None else {}
+            merged.update(self.policies)
+            self._merged_policies = MappingProxyType(merged)
+            self._merged_version = Node._tree_version
+        return self._merged_policies
 
     def set_policy(self, typ: Type[policy.Policy], value: policy.Policy):
         """
@@ -219,6 +290,7 @@ class Node:
             raise TypeError(f'The policy {value} is not of type {typ}')
         self.policies[typ] = value
         value.node = self
+        Node._tree_version += 1
 
     # ====== Functions on registration  ======
 
@@ -244,6 +316,17 @@ class Node:
         self.app = app
         return await self.on_register(self, app, prefix, cached=False)
 
+    async def flush(self):
+        """
+        Wait for the background work of the static tree to finish.
+        Currently this is the cache saves of received Data, which are not awaited by ``need``.
+        Call it on the root, e.g. before shutting down the application.
+        """
+        tasks = self._background_tasks
+        while tasks:
+            # Failures are logged when the tasks finish
+            await aio.gather(*tasks, return_exceptions=True)
+
     # async def detach(self, app: NDNApp):
     #     raise NotImplementedError('TODO: Not supported yet. Please reset NDNApp.')
 
@@ -266,26 +349,46 @@ class Node:
         if cached:
             if self.matches or not self.children:
                 return await app.register(prefix, root._on_interest_root, root._int_validator, True)
-        # O/w enumerate its children
-        for comp, chd in self.children.items():
-            if not await chd.on_register(root, app, prefix + [comp], cached=cached):
-                return False
-        return True
+        # O/w enumerate its children. The registrations are independent, so they are sent concurrently
+        results = await aio.gather(*(chd.on_register(root, app, prefix + [comp], cached=cached)
+                                     for comp, chd in self.children.items()))
+        return all(results)
 
     async def _int_validator(self, name: FormalName, sig_ptrs: SignaturePtrs) -> bool:
         match = self.match(name)
         validate_policy = match.policies.get(policy.InterestValidator, None)
         if validate_policy is None:
-            return await sha256_digest_checker(name, sig_ptrs)
-        if isinstance(validate_policy, policy.InterestValidator):
-            return await validate_policy.validate(match, sig_ptrs)
+            result = await sha256_digest_checker(name, sig_ptrs)
+        elif validate_policy.validate_sync is not None:
+            result = validate_policy.validate_sync(match, sig_ptrs)
         else:
-            raise TypeError(f'The InterestValidator policy is of wrong type. Name={Name.to_str(name)}')
+            result = await validate_policy.validate(match, sig_ptrs)
+        # NDNApp calls _on_interest_root with the same name object right after a successful validation,
+        # without awaiting in between (see NDNApp._on_interest).
+        # Nothing is kept on failure, since the name may pin the receive buffer.
+        self._last_validated = (name, match) if result else None
+        return result
 
     def _on_interest_root(self, name: FormalName, param: InterestParam,
                           app_param: Optional[BinaryStr], raw_packet: BinaryStr):
-        match = self.match(name)
-        aio.create_task(match.on_interest(param, app_param, raw_packet))
+        last_validated = self._last_validated
+        # Clear the entry either way. It does not belong to this name if, e.g., the Interest was unsigned
+        # and not validated, so it must not outlive this call
+        self._last_validated = None
+        if last_validated is not None and last_validated[0] is name:
+            match = last_validated[1]
+        else:
+            match = self.match(name)
+        # Serve hits of a synchronous cache right away, without creating a task
+        cache_policy = match.policies.get(policy.Cache, None)
+        if cache_policy is not None and cache_policy.search_sync is not None:
+            data_raw = cache_policy.search_sync(match, name, param)
+            if data_raw is not None:
+                self.app.put_raw_packet(data_raw)
+                return
+            aio.create_task(match._on_interest_miss(param, app_param, raw_packet))
+        else:
+            aio.create_task(match.on_interest(param, app_param, raw_packet))
 
     # ====== Functions on Interest & Data processing (For overriding)  ======
 
@@ -353,7 +456,7 @@ class Node:
         return await match.put_data(content, **kwargs)
 
 
-@dataclass
+@dataclass(slots=True)
 class MatchedNode:
     r"""
     MatchedNode represents a matched static tree node.
@@ -371,17 +474,21 @@ class MatchedNode:
     :ivar pos: an integer indicating the length the name is matched. Generally, it equals the length of ``name``.
     :vartype pos: int
     :ivar env: a dict containing the value all pattern variables matched on the path.
+        A match produced by :meth:`finer_match` shares this dict with the match it was derived from
+        when the extra components bind no new variable, so it must not be modified.
+        Copy it first, e.g. ``{**match.env, 'key': value}``, to derive a modified environment.
     :vartype env: Dict[str, Any]
-    :ivar policies: a dict collecting all policies that apply to this node.
+    :ivar policies: a read-only mapping collecting all policies that apply to this node.
         For each type of policy, the one attached on the nearst ancestor is collected here.
-    :vartype policies: Dict[Type[policy.Policy], policy.Policy]
+        It is shared by all matches of the same node; use :meth:`Node.set_policy` to change policies.
+    :vartype policies: Mapping[Type[policy.Policy], policy.Policy]
     """
     root: Node
     node: Node
     name: FormalName
     pos: int
     env: Dict[str, Any]
-    policies: Dict[Type[policy.Policy], policy.Policy]
+    policies: Mapping[Type[policy.Policy], policy.Policy]
 
     def finer_match(self, new_name: FormalName):
         """
@@ -390,7 +497,7 @@ class MatchedNode:
         then we can call finer_match with ``/a/b/c``.
 
         :param new_name: the new name to be matched. Must include current ``name`` as its prefix.
-        :return: the new matched node.
+        :return: the new matched node. Its ``env`` may be the same dict as this match's ``env``.
         """
         name_len = len(self.name)
         if self.pos < name_len:
@@ -398,22 +505,12 @@ class MatchedNode:
             return MatchedNode(root=self.root, node=self.node, name=new_name, pos=self.pos,
                                env=self.env, policies=self.policies)
 
-        env = self.env.copy()
-        policies = self.policies.copy()
-        pos = None
-        cur = self.node
-        for i in range(name_len, len(new_name)):
-            comp = new_name[i]
-            nxt = cur._match_step(bytes(comp), env, policies)
-            if not nxt:
-                pos = i
-                break
-            else:
-                cur = nxt
-        if pos is None:
-            pos = len(new_name)
-        policies.update(cur.policies)
-        return MatchedNode(root=self.root, node=cur, name=new_name, pos=pos, env=env, policies=policies)
+        new_env = {}
+        cur, pos = self.node._walk(new_name, name_len, new_env)
+        # Share env with this match unless the suffix assigned a pattern variable, as above
+        env = {**self.env, **new_env} if new_env else self.env
+        return MatchedNode(root=self.root, node=cur, name=new_name, pos=pos, env=env,
+                           policies=cur._get_merged_policies())
 
     async def on_interest(self, param: InterestParam, app_param: Optional[BinaryStr], raw_packet: BinaryStr):
         """
@@ -427,17 +524,27 @@ class MatchedNode:
         """
         # Cache search
         cache_policy = self.policies.get(policy.Cache, None)
-        if cache_policy and isinstance(cache_policy, policy.Cache):
-            data_raw = await cache_policy.search(self, self.name, param)
+        if cache_policy is not None:
+            if cache_policy.search_sync is not None:
+                data_raw = cache_policy.search_sync(self, self.name, param)
+            else:
+                data_raw = await cache_policy.search(self, self.name, param)
             if data_raw is not None:
                 self.root.app.put_raw_packet(data_raw)
                 return
+        await self._on_interest_miss(param, app_param, raw_packet)
+
+    async def _on_interest_miss(self, param: InterestParam, app_param: Optional[BinaryStr], raw_packet: BinaryStr):
+        # The part of on_interest after the cache is missed
         # By design, we do not cache Interest
         # Decrypt app_param
         if app_param:
             ac_policy = self.policies.get(policy.InterestEncryption, None)
-            if ac_policy and isinstance(ac_policy, policy.InterestEncryption):
-                app_param = await ac_policy.decrypt(self, app_param)
+            if ac_policy is not None:
+                if ac_policy.decrypt_sync is not None:
+                    app_param = ac_policy.decrypt_sync(self, app_param)
+                else:
+                    app_param = await ac_policy.decrypt(self, app_param)
         # Process Interest
         await self.node.process_int(self, param, app_param, raw_packet)
 
@@ -455,15 +562,26 @@ class MatchedNode:
         # Cache save
         if policy.LocalOnly not in self.policies:
             cache_policy = self.policies.get(policy.Cache, None)
-            if cache_policy and isinstance(cache_policy, policy.Cache):
-                # aio.ensure_future(cache_policy.save(self, self.name, raw_packet))
-                # self.name may change after this time point, so we have to wait until its finish
-                await cache_policy.save(self, self.name, raw_packet)
+            if cache_policy is not None:
+                if cache_policy.save_sync is not None:
+                    cache_policy.save_sync(self, self.name, raw_packet)
+                else:
+                    # The Data is processed without waiting for the cache write.
+                    # self.name may change after this time point, so the task gets a copy of it
+                    task = aio.create_task(cache_policy.save(self, list(self.name), raw_packet))
+                    tasks = self.root._background_tasks
+                    if tasks is None:
+                        tasks = self.root._background_tasks = set()
+                    tasks.add(task)
+                    task.add_done_callback(functools.partial(_background_task_done, tasks))
         # Decrypt content
         if content is not None:
             ac_policy = self.policies.get(policy.DataEncryption, None)
-            if ac_policy and isinstance(ac_policy, policy.DataEncryption):
-                content = await ac_policy.decrypt(self, content)
+            if ac_policy is not None:
+                if ac_policy.decrypt_sync is not None:
+                    content = ac_policy.decrypt_sync(self, content)
+                else:
+                    content = await ac_policy.decrypt(self, content)
         # Process Data
         return await self.node.process_data(self, meta_info, content, raw_packet)
 
@@ -490,8 +608,11 @@ class MatchedNode:
 
         # Cache search
         cache_policy = self.policies.get(policy.Cache, None)
-        if cache_policy and isinstance(cache_policy, policy.Cache):
-            data_raw = await cache_policy.search(self, self.name, param)
+        if cache_policy is not None:
+            if cache_policy.search_sync is not None:
+                data_raw = cache_policy.search_sync(self, self.name, param)
+            else:
+                data_raw = await cache_policy.search(self, self.name, param)
             if data_raw is not None:
                 with_tl = (data_raw[0] == TypeNumber.DATA)
                 data_name, meta_info, content, _ = parse_data(data_raw, with_tl=with_tl)
@@ -500,28 +621,62 @@ class MatchedNode:
         local_policy = self.policies.get(policy.LocalOnly, None)
         if local_policy:
             raise LocalResourceNotExistError(self.name)
+        # Join an identical fetch in flight, so concurrent misses of a cached name send one Interest
+        fetch_key = None
+        if cache_policy is not None and app_param is None:
+            fetch_key = (tuple(map(bytes, self.name)), param.can_be_prefix, param.must_be_fresh)
+            pending = self.root._pending_fetches
+            if pending is None:
+                pending = self.root._pending_fetches = {}
+            shared = pending.get(fetch_key, None)
+            if shared is not None and shared.can_join(param):
+                data_name, meta_info, content, data_raw = await shared.wait(pending, fetch_key)
+                return await self.finer_match(data_name).on_data(meta_info, content, data_raw)
         # Encrypt app_param
         if app_param is not None:
             ac_policy = self.policies.get(policy.InterestEncryption, None)
-            if ac_policy and isinstance(ac_policy, policy.InterestEncryption):
-                app_param = await ac_policy.encrypt(self, app_param)
+            if ac_policy is not None:
+                if ac_policy.encrypt_sync is not None:
+                    app_param = ac_policy.encrypt_sync(self, app_param)
+                else:
+                    app_param = await ac_policy.encrypt(self, app_param)
         # Get validator TODO: How can we pass information out?
         validate_policy = self.policies.get(policy.DataValidator, None)
-        if validate_policy and isinstance(validate_policy, policy.DataValidator):
+        if validate_policy is not None:
             validator = validate_policy.get_validator(self)
         else:
             validator = sha256_digest_checker  # Change this if possible
         # Get signer
         signer_policy = self.policies.get(policy.InterestSigning, None)
-        if signer_policy and isinstance(signer_policy, policy.InterestSigning):
-            signer = signer_policy.get_signer(self)
+        if signer_policy is not None:
+            if signer_policy.get_signer_sync is not None:
+                signer = signer_policy.get_signer_sync(self)
+            else:
+                signer = signer_policy.get_signer(self)
+                if inspect.isawaitable(signer):
+                    signer = await signer
         elif app_param is not None:
             signer = DigestSha256Signer()
         else:
             signer = None
         # Express interest
-        data = await self.root.app.express_interest(self.name, app_param, validator, need_raw_packet=True,
-                                                    interest_param=param, signer=signer)
+        fetch = self.root.app.express_interest(self.name, app_param, validator, need_raw_packet=True,
+                                               interest_param=param, signer=signer)
+        if fetch_key is not None:
+            # Run the fetch as a task, so it survives the cancellation of any single caller
+            shared = _SharedFetch(aio.ensure_future(fetch), param)
+            pending[fetch_key] = shared
+
+            def fetch_done(fut: aio.Future):
+                if pending.get(fetch_key, None) is shared:
+                    del pending[fetch_key]
+                if not fut.cancelled():
+                    fut.exception()  # Mark the exception as retrieved when all callers are gone
+
+            shared.task.add_done_callback(fetch_done)
+            data = await shared.wait(pending, fetch_key)
+        else:
+            data = await fetch
         data_name, meta_info, content, data_raw = data
         return await self.finer_match(data_name).on_data(meta_info, content, data_raw)
 
@@ -539,6 +694,21 @@ class MatchedNode:
         """
         return self.node.need(self, **kwargs)
 
+    async def need_many(self, suffixes: list[NonStrictName], **kwargs):
+        """
+        Consume several objects under this node concurrently.
+        Each suffix is appended to the name of this match, and ``need`` is called on the finer match.
+        The Interests are in flight at the same time, so fetching N independent objects takes about
+        one round trip instead of N.
+
+        :param suffixes: the name suffixes of the objects, relative to this match.
+        :param kwargs: arguments passed to every ``need``.
+        :return: a list of the objects needed, in the same order as ``suffixes``.
+            If any ``need`` raises an exception, the first one is propagated.
+        """
+        return await aio.gather(*(self.finer_match(self.name + Name.normalize(suffix)).need(**kwargs)
+                                  for suffix in suffixes))
+
     def provide(self, content, **kwargs):
         """
         Produce an object corresponding to this node, and make all generated Data packets available.
@@ -569,21 +739,33 @@ class MatchedNode:
         # Encrypt content
         if content is not None:
             ac_policy = self.policies.get(policy.DataEncryption, None)
-            if ac_policy and isinstance(ac_policy, policy.DataEncryption):
-                content = await ac_policy.encrypt(self, content)
+            if ac_policy is not None:
+                if ac_policy.encrypt_sync is not None:
+                    content = ac_policy.encrypt_sync(self, content)
+                else:
+                    content = await ac_policy.encrypt(self, content)
         # Get signer
         signer_policy = self.policies.get(policy.DataSigning, None)
-        if signer_policy and isinstance(signer_policy, policy.DataSigning):
-            signer = signer_policy.get_signer(self)
+        if signer_policy is not None:
+            if signer_policy.get_signer_sync is not None:
+                signer = signer_policy.get_signer_sync(self)
+            else:
+                signer = signer_policy.get_signer(self)
+                if inspect.isawaitable(signer):
+                    signer = await signer
         else:
             signer = self.root.app.keychain.get_signer(kwargs)
         # Prepare Data packet
         raw_packet = self.root.app.prepare_data(data_name, content, meta_info=meta_info, signer=signer)
         # Cache save
         cache_policy = self.policies.get(policy.Cache, None)
-        if cache_policy and isinstance(cache_policy, policy.Cache):
-            # aio.ensure_future(cache_policy.save(self, self.name, raw_packet))
-            await cache_policy.save(self, self.name, raw_packet)
+        if cache_policy is not None:
+            # Unlike on_data, the save is awaited: a producer expects its Data to be in the cache
+            # once provide returns, since that is where Interests for it are answered from
+            if cache_policy.save_sync is not None:
+                cache_policy.save_sync(self, self.name, raw_packet)
+            else:
+                await cache_policy.save(self, self.name, raw_packet)
         # face.put
         if send_packet:
             self.root.app.put_raw_packet(raw_packet)
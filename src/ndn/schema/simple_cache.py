@@ -16,6 +16,8 @@
 # limitations under the License.
 # -----------------------------------------------------------------------------
 import logging
+from collections import OrderedDict
+from typing import Optional
 from ..encoding import FormalName, Name, BinaryStr, InterestParam
 from ..name_tree import NameTrie
 from .schema_tree import MatchedNode
@@ -25,11 +27,20 @@ from . import policy
 class MemoryCache:
     """
     MemoryCache is a simple cache class that supports searching and storing Data packets in the memory.
+    Packets are indexed by a name trie for prefix matching, and by a dict of exact names,
+    so the common case of an Interest naming the exact Data is a single hash lookup.
+
+    :param capacity: the maximum number of Data packets kept. When it is exceeded, the least recently used
+        packet is evicted. ``None`` means unlimited.
     """
-    def __init__(self):
+    def __init__(self, capacity: Optional[int] = None):
         self.data = NameTrie()
+        self.capacity = capacity
+        # Exact name -> packet, also keeping the recency order of stored names
+        self._exact = OrderedDict()
+        self.logger = logging.getLogger(__name__)
 
-    async def search(self, name: FormalName, param: InterestParam):
+    def search_sync(self, name: FormalName, param: InterestParam):
         """
         Search for the data packet that satisfying an Interest packet with name specified.
 
@@ -37,30 +48,88 @@ class MemoryCache:
         :param param: the parameters of the Interest. Not used in current implementation.
         :return: a raw Data packet or None.
         """
-        try:
-            return next(self.data.itervalues(prefix=name, shallow=True))
-        except KeyError:
-            logging.getLogger(__name__).debug(f'Cache miss: {Name.to_str(name)}')
-            return None
+        exact_key = tuple(map(bytes, name))
+        packet = self._exact.get(exact_key)
+        if packet is not None:
+            key = exact_key
+        else:
+            try:
+                key, packet = next(self.data.iteritems(prefix=name, shallow=True))
+            except KeyError:
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(f'Cache miss: {Name.to_str(name)}')
+                return None
+            key = tuple(map(bytes, key))
+        if self.capacity is not None:
+            self._exact.move_to_end(key)
+        return packet
 
-    async def save(self, name: FormalName, packet: BinaryStr):
+    def save_sync(self, name: FormalName, packet: BinaryStr):
         """
         Save a Data packet with name into the memory storage.
 
         :param name: the Data name.
         :param packet: the raw Data packet.
         """
-        logging.getLogger(__name__).debug(f'Cache save: {Name.to_str(name)}')
-        self.data[name] = bytes(packet)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f'Cache save: {Name.to_str(name)}')
+        packet = bytes(packet)
+        key = tuple(map(bytes, name))
+        self.data[name] = packet
+        self._exact[key] = packet
+        if self.capacity is not None:
+            self._exact.move_to_end(key)
+            while len(self._exact) > self.capacity:
+                evicted, _ = self._exact.popitem(last=False)
+                del self.data[list(evicted)]
+
+    async def search(self, name: FormalName, param: InterestParam):
+        """
+        Coroutine version of :meth:`search_sync`.
+        """
+        return self.search_sync(name, param)
+
+    async def save(self, name: FormalName, packet: BinaryStr):
+        """
+        Coroutine version of :meth:`save_sync`.
+        """
+        self.save_sync(name, packet)
+
+
+def _sync_variant(cache, sync_name: str, async_name: str):
+    # The wrapped cache's sync method stands for its coroutine only if it is not older than the coroutine
+    cls = type(cache)
+    sync_owner = next((c for c in cls.__mro__ if sync_name in c.__dict__), None)
+    async_owner = next((c for c in cls.__mro__ if async_name in c.__dict__), None)
+    if sync_owner is None or getattr(cache, sync_name) is None:
+        return None
+    if async_owner is not None and async_owner is not sync_owner and issubclass(async_owner, sync_owner):
+        return None
+    func = getattr(cache, sync_name)
+
+    def wrapper(match, name, arg):
+        return func(name, arg)
+    return wrapper
 
 
 class MemoryCachePolicy(policy.Cache):
     """
     MemoryCachePolicy stores Data packets in memory.
+
+    :param cache: the cache storing packets, usually a :class:`MemoryCache`.
+        Its ``search_sync`` and ``save_sync`` are used by the schema tree when it provides them
+        and has not overridden the corresponding coroutine.
     """
+    __slots__ = ('cache', 'search_sync', 'save_sync')
+
     def __init__(self, cache):
         super().__init__()
         self.cache = cache
+        # A subclass overriding search() or save() has the class-level variant unset; keep it that way
+        if type(self).search_sync is not None:
+            self.search_sync = _sync_variant(cache, 'search_sync', 'search')
+        if type(self).save_sync is not None:
+            self.save_sync = _sync_variant(cache, 'save_sync', 'save')
 
     async def search(self, match: MatchedNode, name: FormalName, param: InterestParam):
         return await self.cache.search(name, param)
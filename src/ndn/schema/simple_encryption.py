@@ -0,0 +1,105 @@
+# -----------------------------------------------------------------------------
+# Copyright (C) 2019-2024 The python-ndn authors
+#
+# This file is part of python-ndn.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+import asyncio as aio
+from concurrent.futures import Executor
+from typing import Optional
+from Cryptodome.Cipher import AES
+from Cryptodome.Random import get_random_bytes
+from ..encoding import BinaryStr
+from . import policy
+
+
+class AesGcmEncryption(policy.InterestEncryption, policy.DataEncryption):
+    """
+    AesGcmEncryption encrypts content with AES-GCM using a pre-shared symmetric key.
+    The output is the 12-byte nonce, followed by the 16-byte tag and the cipher text.
+    A fresh random nonce is generated for every message, so the same key can be used for many packets.
+
+    Pycryptodome uses AES-NI (or ARMv8 Crypto Extensions) when the CPU supports it.
+    The methods never await, so the synchronous variants are provided to the schema tree.
+
+    For example,
+
+    .. code-block:: python3
+
+        enc = AesGcmEncryption(key)
+        root['/file/<name>'].set_policy(policy.DataEncryption, enc)
+
+    :param key: the AES key, 16, 24 or 32 bytes long.
+    """
+    __slots__ = ('key',)
+
+    NONCE_SIZE = 12
+    TAG_SIZE = 16
+
+    def __init__(self, key: BinaryStr):
+        super().__init__()
+        if len(key) not in (16, 24, 32):
+            raise ValueError(f'Invalid AES key length: {len(key)}')
+        self.key = bytes(key)
+
+    def _encrypt(self, match, content: BinaryStr) -> Optional[BinaryStr]:
+        cipher = AES.new(self.key, AES.MODE_GCM, nonce=get_random_bytes(self.NONCE_SIZE), mac_len=self.TAG_SIZE)
+        cipher_text, tag = cipher.encrypt_and_digest(content)
+        return cipher.nonce + tag + cipher_text
+
+    def _decrypt(self, match, content: BinaryStr) -> Optional[BinaryStr]:
+        header_len = self.NONCE_SIZE + self.TAG_SIZE
+        if len(content) < header_len:
+            return None
+        cipher = AES.new(self.key, AES.MODE_GCM, nonce=bytes(content[:self.NONCE_SIZE]), mac_len=self.TAG_SIZE)
+        try:
+            return cipher.decrypt_and_verify(content[header_len:], content[self.NONCE_SIZE:header_len])
+        except ValueError:
+            return None
+
+    encrypt_sync = _encrypt
+    decrypt_sync = _decrypt
+
+    async def encrypt(self, match, content: BinaryStr) -> Optional[BinaryStr]:
+        return self._encrypt(match, content)
+
+    async def decrypt(self, match, content: BinaryStr) -> Optional[BinaryStr]:
+        return self._decrypt(match, content)
+
+
+class ThreadedAesGcmEncryption(AesGcmEncryption):
+    """
+    ThreadedAesGcmEncryption is an :class:`AesGcmEncryption` running the cipher in an executor.
+    Pycryptodome releases the GIL inside its C routines. For large payloads, passing a
+    :class:`concurrent.futures.ThreadPoolExecutor` runs the cipher in worker threads,
+    so several packets can be processed in parallel while the event loop keeps running.
+
+    :param key: the AES key, 16, 24 or 32 bytes long.
+    :param executor: the executor running the cipher.
+    """
+    __slots__ = ('executor',)
+
+    # The schema tree awaits encrypt() and decrypt() when the sync variants are unset
+    encrypt_sync = None
+    decrypt_sync = None
+
+    def __init__(self, key: BinaryStr, executor: Executor):
+        super().__init__(key)
+        self.executor = executor
+
+    async def encrypt(self, match, content: BinaryStr) -> Optional[BinaryStr]:
+        return await aio.get_running_loop().run_in_executor(self.executor, self._encrypt, None, bytes(content))
+
+    async def decrypt(self, match, content: BinaryStr) -> Optional[BinaryStr]:
+        return await aio.get_running_loop().run_in_executor(self.executor, self._decrypt, None, bytes(content))
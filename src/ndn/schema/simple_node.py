@@ -16,6 +16,9 @@
 # limitations under the License.
 # -----------------------------------------------------------------------------
 # TODO: Change these names
+import asyncio as aio
+import functools
+from collections import deque
 from .schema_tree import Node
 from .util import norm_pattern
 from ..encoding import Name, Component, TlvModel, NameField, ContentType
@@ -23,6 +26,13 @@ from ..types import InterestTimeout
 from ..utils import timestamp
 
 
+@functools.lru_cache(maxsize=4096)
+def _segment_component(seg_no: int) -> bytes:
+    # Segment loops encode the same small numbers for every object.
+    # The component is cached as bytes so a shared copy cannot be modified through a name.
+    return bytes(Component.from_segment(seg_no))
+
+
 class LocalResource(Node):
     """
     LocalResource is a custom node that preloads some data.
@@ -52,20 +62,27 @@ class SegmentedNode(Node):
     whose name have a suffix "/seg=seg_no" attached to the object's name.
     The ``provide`` function handles segmentation, and the ``need`` function handles reassembly.
 
-    .. note::
+    Segments are fetched by a fixed-window pipeline, with up to ``pipeline_size`` Interests in-flight at one time.
+    The first segment is fetched alone, so a small object whose first segment carries the FinalBlockId
+    costs one Interest. Outstanding Interests beyond the final block are cancelled once it is known.
 
-        Currently, the fetching pipeline is a simple one-by-one pipeline.
-        where only one Interest will be in-flight at one time.
+    :param timeout: the Interest lifetime used to fetch each segment, in milliseconds.
+    :param retry_times: the number of times a segment is tried before giving up.
+    :param segment_size: the maximum size of the content of one segment.
+    :param pipeline_size: the maximum number of segment Interests in-flight at one time.
     """
     SEGMENT_PATTERN = norm_pattern('<seg:seg_no>')[0]
     SEGMENT_SIZE = 4400
+    PIPELINE_SIZE = 8
 
-    def __init__(self, parent=None, timeout=4000, retry_times=3, segment_size=SEGMENT_SIZE):
+    def __init__(self, parent=None, timeout=4000, retry_times=3, segment_size=SEGMENT_SIZE,
+                 pipeline_size=PIPELINE_SIZE):
         super().__init__(parent)
         self._set(self.SEGMENT_PATTERN, Node())
         self.timeout = timeout
         self.retry_times = retry_times
         self.segment_size = segment_size
+        self.pipeline_size = pipeline_size
 
     async def retry(self, submatch, must_be_fresh):
         trial_times = 0
@@ -80,23 +97,40 @@ class SegmentedNode(Node):
     async def need(self, match, **kwargs):
         if match.pos < len(match.name):
             raise ValueError(f'{Name.to_str(match.name)} does not match with the structure')
-        subname = match.name + [None]
         must_be_fresh = kwargs.get('must_be_fresh', True)
         contents = []
-        cur = 0
-        while True:
-            subname[-1] = Component.from_segment(cur)
-            submatch = match.finer_match(subname)
-            segment, meta_data = await self.retry(submatch, must_be_fresh)
-            contents.append(segment)
-            if meta_data['final_block_id'] == subname[-1]:
-                break
-            cur += 1
+        pending = deque()
+        next_seg = 0
+        # Number of the last segment, once learnt from a FinalBlockId
+        final_seg = None
+        # The window widens once the first segment arrives
+        window = 1
+        try:
+            while True:
+                while len(pending) < window and (final_seg is None or next_seg <= final_seg):
+                    # finer_match keeps the name list, so every in-flight segment needs its own
+                    submatch = match.finer_match(match.name + [_segment_component(next_seg)])
+                    pending.append(aio.ensure_future(self.retry(submatch, must_be_fresh)))
+                    next_seg += 1
+                segment, meta_data = await pending.popleft()
+                contents.append(segment)
+                window = self.pipeline_size
+                final_block_id = meta_data['final_block_id']
+                if final_seg is None and final_block_id is not None:
+                    if Component.get_type(final_block_id) == Component.TYPE_SEGMENT:
+                        final_seg = Component.to_number(final_block_id)
+                if final_seg is not None and len(contents) > final_seg:
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await aio.gather(*pending, return_exceptions=True)
         ret = b''.join(contents)
         meta_data_ret = {
             **match.env,
             'content_type': meta_data['content_type'],
-            'block_count': cur + 1,
+            'block_count': len(contents),
             'freshness_period': meta_data['freshness_period']
         }
         return ret, meta_data_ret
@@ -104,16 +138,17 @@ class SegmentedNode(Node):
     async def provide(self, match, content, **kwargs):
         seg_cnt = (len(content) + self.segment_size - 1) // self.segment_size
         subname = match.name + [None]
-        final_block_id = Component.from_segment(seg_cnt - 1)
+        kwargs['final_block_id'] = _segment_component(seg_cnt - 1)
+        # Slicing a memoryview does not copy the segment; it is copied once when the Data packet is encoded
+        view = memoryview(content)
         for i in range(seg_cnt):
-            subname[-1] = Component.from_segment(i)
+            subname[-1] = _segment_component(i)
             submatch = match.finer_match(subname)
-            kwargs['final_block_id'] = final_block_id
-            await submatch.provide(content[i*self.segment_size:(i+1)*self.segment_size], **kwargs)
+            await submatch.provide(view[i*self.segment_size:(i+1)*self.segment_size], **kwargs)
 
     async def process_int(self, match, param, app_param, raw_packet):
         if match.pos == len(match.name):
-            submatch = match.finer_match(match.name + [Component.from_segment(0)])
+            submatch = match.finer_match(match.name + [_segment_component(0)])
             return await submatch.on_interest(param, None, raw_packet)
 
 
@@ -15,8 +15,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # -----------------------------------------------------------------------------
+import asyncio as aio
+import functools
 import logging
-from typing import Callable, Dict, Any
+from collections import OrderedDict
+from concurrent.futures import Executor
+from hashlib import sha256
+from typing import Callable, Dict, Any, Optional
 from Cryptodome.PublicKey import ECC, RSA
 from Cryptodome.Signature import DSS, pkcs1_15
 from Cryptodome.Hash import SHA256
@@ -29,6 +34,57 @@ from . import policy
 Checker = Callable[[Dict[str, Any], Dict[str, Any]], bool]
 
 
+class _Sha256Digest:
+    """
+    A finished SHA-256 digest exposing the part of the Cryptodome hash object interface
+    that signature verifiers use. It lets the digest be computed by :mod:`hashlib`,
+    which has a much lower per-call overhead than :mod:`Cryptodome.Hash`.
+    """
+    __slots__ = ('_digest',)
+    oid = SHA256.SHA256Hash.oid
+    digest_size = SHA256.digest_size
+
+    def __init__(self, digest: bytes):
+        self._digest = digest
+
+    def digest(self) -> bytes:
+        return self._digest
+
+
+@functools.lru_cache(maxsize=256)
+def _load_verifier(sig_type: int, key_bits: bytes):
+    # Importing a key parses its ASN.1 structure, which costs far more than the verification itself.
+    # The same key usually signs many packets, and the verifier objects hold no per-message state.
+    try:
+        if sig_type == SignatureType.SHA256_WITH_RSA:
+            return pkcs1_15.new(RSA.import_key(key_bits))
+        else:
+            return DSS.new(ECC.import_key(key_bits), 'fips-186-3', 'der')
+    except (ValueError, IndexError, TypeError):
+        return None
+
+
+def _verify_signature(sig_type: int, key_bits: bytes, digest: bytes, sig_value: bytes) -> Optional[bool]:
+    """
+    Verify a signature over a SHA-256 digest.
+    This is a module-level function taking only bytes, so it can be run in a process pool.
+
+    :param sig_type: the signature type, either ``SHA256_WITH_RSA`` or ``SHA256_WITH_ECDSA``.
+    :param key_bits: the public key in DER format.
+    :param digest: the SHA-256 digest of the signed portion.
+    :param sig_value: the signature value.
+    :return: whether the signature is valid. None if the key is malformed.
+    """
+    verifier = _load_verifier(sig_type, key_bits)
+    if verifier is None:
+        return None
+    try:
+        verifier.verify(_Sha256Digest(digest), sig_value)
+    except ValueError:
+        return False
+    return True
+
+
 class SignedBy(policy.DataValidator, policy.InterestValidator):
     r"""
     SignedBy policy represents the trust schema,
@@ -65,12 +121,38 @@ class SignedBy(policy.DataValidator, policy.InterestValidator):
         root['/blog/<Author>/<Category>/<Date>'].set_policy(
             policy.DataValidator,
             SignedBy(root['/author/<Author>/KEY/<KeyID>'], subject_to=check_author))
+
+    Successful verifications are remembered, keyed by the digest of the signed portion and the signature value,
+    so a packet seen again (e.g. a certificate validated for every Data it signs) is not verified twice.
+    Failures are not cached, since they may be caused by a transient failure fetching the key.
+    Call :meth:`clear_cache` after a key is revoked or replaced.
+
+    Signature verification runs on the event loop by default.
+    Passing a :class:`concurrent.futures.ProcessPoolExecutor` as ``executor`` moves it to worker processes,
+    so verification of many packets can use multiple cores.
+
+    :param key: the node of the key used to sign the packet.
+    :param subject_to: the checker on the pattern variables of the packet and the key.
+    :param cache_size: the maximum number of verification results kept. 0 disables the cache.
+    :param executor: the executor running signature verification. None means running it inline.
     """
-    def __init__(self, key: Node, subject_to: Checker = None):
+    __slots__ = ('key', 'subject_to', 'logger', 'cache_size', 'executor', '_verified')
+
+    def __init__(self, key: Node, subject_to: Checker = None, cache_size: int = 4096,
+                 executor: Optional[Executor] = None):
         super().__init__()
         self.key = key
         self.subject_to = subject_to
         self.logger = logging.getLogger(__name__)
+        self.cache_size = cache_size
+        self.executor = executor
+        self._verified = OrderedDict()
+
+    def clear_cache(self):
+        """
+        Forget all cached verification results.
+        """
+        self._verified.clear()
 
     def get_validator(self, match) -> Validator:
         def validator(name: FormalName, sig_ptrs: SignaturePtrs):
@@ -82,6 +164,18 @@ class SignedBy(policy.DataValidator, policy.InterestValidator):
         if sig_ptrs.signature_info is None or sig_ptrs.signature_info.key_locator is None:
             self.logger.info(f'{Name.to_str(match.name)} => Not signed')
             return False
+        if sig_ptrs.signature_value_buf is None:
+            self.logger.info(f'{Name.to_str(match.name)} => Not signed')
+            return False
+        # The digest is needed for verification anyway, so it doubles as the cache key
+        # Covered parts are a few small pieces of one packet, so joining them is cheaper than one update per piece
+        digest = sha256(b''.join(sig_ptrs.signature_covered_part)).digest()
+        cache_key = digest + bytes(sig_ptrs.signature_value_buf)
+        if cache_key in self._verified:
+            self._verified.move_to_end(cache_key)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f'{Name.to_str(match.name)} => Verification passed (cached)')
+            return True
         key_name = sig_ptrs.signature_info.key_locator.name
         if not key_name:
             self.logger.info(f'{Name.to_str(match.name)} => Not signed')
@@ -102,30 +196,60 @@ class SignedBy(policy.DataValidator, policy.InterestValidator):
         except ValidationFailure:
             self.logger.info(f'{Name.to_str(match.name)} => The key {Name.to_str(key_name)} cannot be verified')
             return False
-        # Import key
+        # Verify signature
         sig_type = sig_ptrs.signature_info.signature_type
-        key_bits = bytes(key_bits)
-        try:
-            if sig_type == SignatureType.SHA256_WITH_RSA:
-                pub_key = RSA.import_key(key_bits)
-                verifier = pkcs1_15.new(pub_key)
-            elif sig_type == SignatureType.SHA256_WITH_ECDSA:
-                pub_key = ECC.import_key(key_bits)
-                verifier = DSS.new(pub_key, 'fips-186-3', 'der')
-            else:
-                self.logger.info(f'{Name.to_str(match.name)} => Unrecognized signature type {sig_type}')
-                return False
-        except (ValueError, IndexError, TypeError):
+        if sig_type not in (SignatureType.SHA256_WITH_RSA, SignatureType.SHA256_WITH_ECDSA):
+            self.logger.info(f'{Name.to_str(match.name)} => Unrecognized signature type {sig_type}')
+            return False
+        args = (sig_type, bytes(key_bits), digest, bytes(sig_ptrs.signature_value_buf))
+        if self.executor is None:
+            ret = _verify_signature(*args)
+        else:
+            ret = await aio.get_running_loop().run_in_executor(self.executor, _verify_signature, *args)
+        if ret is None:
             self.logger.info(f'{Name.to_str(match.name)} => The key {Name.to_str(key_name)} is malformed')
             return False
-        # Verify signature
-        h = SHA256.new()
-        for content in sig_ptrs.signature_covered_part:
-            h.update(content)
-        try:
-            verifier.verify(h, bytes(sig_ptrs.signature_value_buf))
-        except ValueError:
+        if not ret:
             self.logger.info(f'{Name.to_str(match.name)} => Unable to verify the signature')
             return False
-        self.logger.debug(f'{Name.to_str(match.name)} => Verification passed')
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f'{Name.to_str(match.name)} => Verification passed')
+        if self.cache_size > 0:
+            self._verified[cache_key] = True
+            if len(self._verified) > self.cache_size:
+                self._verified.popitem(last=False)
+        return True
+
+
+class AcceptAll(policy.DataValidator, policy.InterestValidator):
+    r"""
+    AcceptAll policy accepts every packet without verifying its signature.
+    It is intended for subtrees whose packets only come through a trusted transport,
+    e.g. a producer on the same host reached through the local NFD,
+    where the cost of asymmetric signature verification buys nothing.
+
+    .. warning::
+
+        Packets under a node with this policy are not authenticated at all.
+        Do not use it for names that can be reached from the network.
+
+    For example,
+
+    .. code-block:: python3
+
+        root['/localhost/status/<Item>'].set_policy(policy.DataValidator, AcceptAll())
+    """
+    __slots__ = ()
+
+    @staticmethod
+    async def _accept(name: FormalName, sig_ptrs: SignaturePtrs) -> bool:
+        return True
+
+    def get_validator(self, match) -> Validator:
+        return self._accept
+
+    def validate_sync(self, match, sig_ptrs: SignaturePtrs) -> bool:
+        return True
+
+    async def validate(self, match, sig_ptrs: SignaturePtrs) -> bool:
         return True
@@ -15,6 +15,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # -----------------------------------------------------------------------------
+import functools
 from typing import Union, List, Tuple
 from ..encoding import Name, Component, BinaryStr
 
@@ -38,6 +39,19 @@ def norm_pattern(name: str) -> NamePattern:
     :param name: the name pattern string.
     :return: normalized name pattern.
     """
+    if isinstance(name, str):
+        return list(_norm_pattern_str(name))
+    return _norm_pattern(name)
+
+
+@functools.lru_cache(maxsize=512)
+def _norm_pattern_str(name: str) -> tuple:
+    # Node.__getitem__ parses the same path strings over and over.
+    # Components are stored as bytes, so the cached patterns cannot be modified through a returned list.
+    return tuple(comp if isinstance(comp, tuple) else bytes(comp) for comp in _norm_pattern(name))
+
+
+def _norm_pattern(name) -> NamePattern:
     ret = Name.normalize(name)[:]
     for i, comp in enumerate(ret):
         comp_type = Component.get_type(comp)
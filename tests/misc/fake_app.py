@@ -0,0 +1,71 @@
+# -----------------------------------------------------------------------------
+# Copyright (C) 2019-2024 The python-ndn authors
+#
+# This file is part of python-ndn.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+import asyncio as aio
+from ndn.encoding import Name, MetaInfo, make_data, parse_data
+from ndn.security import DigestSha256Signer
+
+
+class FakeApp:
+    """
+    A stand-in for NDNApp used by schema tree tests.
+    It records expressed Interests, registered prefixes and sent packets,
+    and counts the calls in flight. Tests override :meth:`delay` and :meth:`respond` to shape the answers.
+    """
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.cancelled = 0
+        self.expressed = []
+        self.prefixes = []
+        self.sent = []
+
+    def delay(self, name) -> float:
+        return 0.01
+
+    def respond(self, name):
+        """
+        :return: the content and MetaInfo of the Data answering an Interest for ``name``.
+        """
+        return Name.to_str(name).encode(), MetaInfo()
+
+    async def _wait(self, name):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await aio.sleep(self.delay(name))
+        except aio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    async def express_interest(self, name, app_param, validator, **kwargs):
+        self.expressed.append((Name.to_str(name), kwargs.get('interest_param', None)))
+        await self._wait(name)
+        content, meta_info = self.respond(name)
+        data = make_data(name, meta_info, content, signer=DigestSha256Signer())
+        data_name, meta_info, content, _ = parse_data(data)
+        return data_name, meta_info, content, data
+
+    async def register(self, name, func, validator=None, need_raw_packet=False, need_sig_ptrs=False):
+        await self._wait(name)
+        self.prefixes.append(Name.to_str(name))
+        return True
+
+    def put_raw_packet(self, packet):
+        self.sent.append(packet)
@@ -0,0 +1,86 @@
+# -----------------------------------------------------------------------------
+# Copyright (C) 2019-2024 The python-ndn authors
+#
+# This file is part of python-ndn.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+import asyncio as aio
+import pytest
+from ndn import name_tree
+from ndn.encoding import Name, InterestParam
+from ndn.name_tree import NameTrie, InterestTreeNode
+
+
+@pytest.fixture(params=['internals', 'public'])
+def walk(request, monkeypatch):
+    # Run the lookups both on pygtrie's internals and on the public API fallback
+    if request.param == 'public':
+        monkeypatch.setattr(name_tree, '_NO_VALUE', None)
+    return request.param
+
+
+class TestNameTrie:
+    @staticmethod
+    def test_internals_checked():
+        assert name_tree._NO_VALUE is not None
+
+    @staticmethod
+    def test_longest_prefix_item(walk):
+        trie = NameTrie()
+        assert trie.longest_prefix_item(Name.from_str('/a/b')) is None
+        trie[Name.from_str('/a')] = 1
+        trie[Name.from_str('/a/b/c')] = 2
+        assert trie.longest_prefix_item(Name.from_str('/a/b')) == (1, 1)
+        assert trie.longest_prefix_item(Name.from_str('/a/b/c/d')) == (3, 2)
+        assert trie.longest_prefix_item(Name.from_str('/b')) is None
+        trie[[]] = 0
+        assert trie.longest_prefix_item(Name.from_str('/b')) == (0, 0)
+
+    @staticmethod
+    def test_longest_prefix_item_memoryview(walk):
+        trie = NameTrie()
+        trie[Name.from_str('/a/b')] = 1
+        wire = bytearray(Name.to_bytes('/a/b/c'))
+        name = Name.from_bytes(memoryview(wire))
+        assert trie.longest_prefix_item(name) == (2, 1)
+
+    @staticmethod
+    def test_iter_prefixes_with_values(walk):
+        trie = NameTrie()
+        trie[Name.from_str('/a')] = 1
+        trie[Name.from_str('/a/b/c')] = 2
+        trie[Name.from_str('/a/b/c/d/e')] = 3
+        name = Name.from_str('/a/b/c/d')
+        assert list(trie.iter_prefixes_with_values(name)) == [(1, 1), (3, 2)]
+        assert [(len(step.key), step.value) for step in trie.prefixes(name)] == [(1, 1), (3, 2)]
+        assert list(trie.iter_prefixes_with_values(Name.from_str('/b'))) == []
+        trie[[]] = 0
+        assert list(trie.iter_prefixes_with_values(Name.from_str('/a'))) == [(0, 0), (1, 1)]
+
+
+class TestInterestTreeNode:
+    @staticmethod
+    def test_satisfy_shares_data():
+        async def run():
+            loop = aio.get_running_loop()
+            node = InterestTreeNode()
+            futures = [loop.create_future() for _ in range(3)]
+            for future in futures:
+                node.append_interest(future, InterestParam(), b'')
+            futures[1].cancel()
+            data = (Name.from_str('/a'), None, b'content', None, b'raw')
+            assert node.satisfy(data, False)
+            assert futures[0].result() is data
+            assert futures[2].result() is data
+        aio.run(run())
@@ -0,0 +1,39 @@
+# -----------------------------------------------------------------------------
+# Copyright (C) 2019-2024 The python-ndn authors
+#
+# This file is part of python-ndn.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+from ndn.platform import Platform
+
+
+class TestPlatform:
+    @staticmethod
+    def test_invalidate_cache(monkeypatch):
+        platform = Platform()
+        probes = []
+
+        def probe():
+            probes.append(None)
+            return f'unix:///run/nfd{len(probes)}.sock'
+
+        monkeypatch.setattr(platform, '_probe_default_transport', probe)
+        platform.invalidate_cache()
+        assert platform.default_transport() == 'unix:///run/nfd1.sock'
+        # The probing result is cached until invalidated
+        assert platform.default_transport() == 'unix:///run/nfd1.sock'
+        assert len(probes) == 1
+        platform.invalidate_cache()
+        assert platform.default_transport() == 'unix:///run/nfd2.sock'
+        platform.invalidate_cache()
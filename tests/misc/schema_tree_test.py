@@ -0,0 +1,241 @@
+# -----------------------------------------------------------------------------
+# Copyright (C) 2019-2024 The python-ndn authors
+#
+# This file is part of python-ndn.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+import asyncio as aio
+import pytest
+from ndn.encoding import Name, Component, InterestParam, SignaturePtrs, MetaInfo
+from ndn.schema import policy
+from ndn.schema.schema_tree import Node
+from ndn.schema.simple_node import SegmentedNode
+from ndn.schema.simple_cache import MemoryCache, MemoryCachePolicy
+from fake_app import FakeApp
+
+
+class TestMatchPolicies:
+    @staticmethod
+    def test_inherited():
+        root = Node()
+        root['/a/<b>/c'] = Node()
+        cache = MemoryCachePolicy(MemoryCache())
+        root.set_policy(policy.Cache, cache)
+        match = root.match('/a/x/c')
+        assert match.policies == {policy.Cache: cache}
+        assert match.node.get_policy(policy.Cache) is cache
+        assert match.node.get_policy(policy.LocalOnly) is None
+
+    @staticmethod
+    def test_updated_after_match():
+        root = Node()
+        root['/a/<b>/c'] = Node()
+        assert root.match('/a/x/c').policies == {}
+        local = policy.LocalOnly()
+        root['/a'].set_policy(policy.LocalOnly, local)
+        assert root.match('/a/x/c').policies == {policy.LocalOnly: local}
+        assert root.match('/d').policies == {}
+        # Nodes added later inherit the policies as well
+        root['/a/e'] = Node()
+        assert root.match('/a/e').policies == {policy.LocalOnly: local}
+
+    @staticmethod
+    def test_read_only():
+        root = Node()
+        root['/a/<b>/c'] = Node()
+        match = root.match('/a/x/c')
+        with pytest.raises(TypeError):
+            match.policies[policy.Cache] = MemoryCachePolicy(MemoryCache())
+        assert root.match('/a/y/c').policies == {}
+        assert root['/a/<b>/c'].get_policy(policy.Cache) is None
+
+    @staticmethod
+    def test_finer_match():
+        root = Node()
+        root['/file/<name>'] = SegmentedNode()
+        cache = MemoryCachePolicy(MemoryCache())
+        root.set_policy(policy.Cache, cache)
+        match = root.match('/file/abc')
+        submatch = match.finer_match(Name.from_str('/file/abc/seg=0'))
+        assert submatch.pos == 3
+        assert submatch.policies == {policy.Cache: cache}
+
+
+class TestMatchPattern:
+    @staticmethod
+    def test_component_types():
+        root = Node()
+        root['/a/<b>'] = Node()
+        root['/a/<seg:s>'] = Node()
+        root['/a/<300:t>'] = Node()
+        match = root.match('/a/x')
+        assert match.pos == 2 and bytes(match.env['b']) == b'x'
+        match = root.match('/a/seg=3')
+        assert match.pos == 2 and 's' in match.env
+        match = root.match('/a/300=y')
+        assert match.pos == 2 and bytes(match.env['t']) == b'y'
+        match = root.match('/a/301=y')
+        assert match.pos == 1 and match.env == {}
+
+    @staticmethod
+    def test_finer_match_env():
+        root = Node()
+        root['/a/<b>/c/<d>'] = Node()
+        match = root.match('/a/x')
+        submatch = match.finer_match(Name.from_str('/a/x/c'))
+        assert submatch.pos == 3 and submatch.env == {'b': b'x'}
+        submatch = submatch.finer_match(Name.from_str('/a/x/c/y'))
+        assert submatch.pos == 4 and submatch.env == {'b': b'x', 'd': b'y'}
+        assert match.env == {'b': b'x'}
+
+    @staticmethod
+    def test_long_component():
+        root = Node()
+        root['/a/<b>'] = Node()
+        value = b'x' * 300
+        match = root.match([Component.from_str('a'), Component.from_bytes(value)])
+        assert match.pos == 2 and match.env['b'] == value
+
+
+class TestAttach:
+    @staticmethod
+    def test_register_concurrently():
+        async def run():
+            root = Node()
+            root['/a/<x>'] = Node()
+            root['/b/<x>'] = Node()
+            root['/c/d'] = Node()
+            root.set_policy(policy.Cache, MemoryCachePolicy(MemoryCache()))
+            app = FakeApp()
+            assert await root.attach(app, '/prefix')
+            assert sorted(app.prefixes) == ['/prefix/a', '/prefix/b', '/prefix/c/d']
+            assert app.max_in_flight == 3
+        aio.run(run())
+
+
+class TestIncomingInterest:
+    @staticmethod
+    def test_validated_match_reused():
+        class Producer(Node):
+            async def process_int(self, match, param, app_param, raw_packet):
+                matches.append(match)
+
+        async def run():
+            root = Node()
+            root['/a/<x>'] = Producer()
+            name = Name.from_str('/a/b')
+            assert await root._int_validator(name, SignaturePtrs())
+            validated = root._last_validated[1]
+            root._on_interest_root(name, InterestParam(), None, b'')
+            root._on_interest_root(Name.from_str('/a/b'), InterestParam(), None, b'')
+            await aio.sleep(0)
+            assert len(matches) == 2 and matches[0] is validated
+            assert matches[0].env == {'x': b'b'} and matches[1].env == {'x': b'b'}
+            assert root._last_validated is None
+
+        matches = []
+        aio.run(run())
+
+    @staticmethod
+    def test_unmatched_validation_cleared():
+        async def run():
+            root = Node()
+            root['/a/<x>'] = Node()
+            assert await root._int_validator(Name.from_str('/a/b'), SignaturePtrs())
+            # An unsigned Interest is not validated, so the entry belongs to another name
+            root._on_interest_root(Name.from_str('/a/c'), InterestParam(), None, b'')
+            assert root._last_validated is None
+            await aio.sleep(0)
+        aio.run(run())
+
+    @staticmethod
+    def test_failed_validation_not_kept():
+        class RejectAll(policy.InterestValidator):
+            def validate_sync(self, match, sig_ptrs):
+                return False
+
+            async def validate(self, match, sig_ptrs):
+                return False
+
+        async def run():
+            root = Node()
+            root['/a/<x>'] = Node()
+            assert await root._int_validator(Name.from_str('/a/b'), SignaturePtrs())
+            assert root._last_validated is not None
+            root['/a/<x>'].set_policy(policy.InterestValidator, RejectAll())
+            assert not await root._int_validator(Name.from_str('/a/c'), SignaturePtrs())
+            assert root._last_validated is None
+        aio.run(run())
+
+
+class TestNeed:
+    @staticmethod
+    def test_need_many():
+        async def run():
+            root = Node()
+            root.app = FakeApp()
+            root['/a/<x>/<y>'] = Node()
+            results = await root.match('/a/b').need_many(['/1', '/2', [Component.from_str('3')]])
+            assert [bytes(content) for content, _ in results] == [b'/a/b/1', b'/a/b/2', b'/a/b/3']
+            assert root.app.max_in_flight == 3
+        aio.run(run())
+
+    @staticmethod
+    def test_segmented_pipeline():
+        class SegmentProducer(FakeApp):
+            def delay(self, name):
+                # Segments past the final block never arrive
+                return 10 if Component.to_number(name[-1]) > 9 else 0.01
+
+            def respond(self, name):
+                seg_no = Component.to_number(name[-1])
+                # Only the last segment carries the FinalBlockId
+                return bytes([seg_no]), MetaInfo(final_block_id=Component.from_segment(9) if seg_no == 9 else None)
+
+        async def run(cached):
+            root = Node()
+            root.app = SegmentProducer()
+            root['/file/<name>'] = SegmentedNode(pipeline_size=4)
+            if cached:
+                # Segment fetches are then shared through the root, and must be cancelled all the same
+                root.set_policy(policy.Cache, MemoryCachePolicy(MemoryCache()))
+            content, meta_data = await root.match('/file/abc').need()
+            assert content == bytes(range(10))
+            assert meta_data['block_count'] == 10
+            assert root.app.max_in_flight == 4
+            # Interests beyond the final block are cancelled
+            await aio.sleep(0)
+            assert root.app.cancelled > 0
+            assert root.app.in_flight == 0
+            assert not root._pending_fetches
+
+        aio.run(run(cached=False))
+        aio.run(run(cached=True))
+
+    @staticmethod
+    def test_segmented_single_segment():
+        class SegmentProducer(FakeApp):
+            def respond(self, name):
+                return b'content', MetaInfo(final_block_id=Component.from_segment(0))
+
+        async def run():
+            root = Node()
+            root.app = SegmentProducer()
+            root['/file/<name>'] = SegmentedNode()
+            content, meta_data = await root.match('/file/abc').need()
+            assert content == b'content' and meta_data['block_count'] == 1
+            # The window is only widened after the first segment, which is also the last
+            assert len(root.app.expressed) == 1
+            assert root.app.cancelled == 0
+        aio.run(run())
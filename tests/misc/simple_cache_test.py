@@ -0,0 +1,257 @@
+# -----------------------------------------------------------------------------
+# Copyright (C) 2019-2024 The python-ndn authors
+#
+# This file is part of python-ndn.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+import asyncio as aio
+from ndn.encoding import Name, Component, InterestParam, MetaInfo, make_data, parse_data
+from ndn.security import DigestSha256Signer
+from ndn.schema import policy
+from ndn.schema.schema_tree import Node
+from ndn.schema.simple_cache import MemoryCache, MemoryCachePolicy
+from fake_app import FakeApp
+
+
+class TestMemoryCache:
+    @staticmethod
+    def test_prefix_search():
+        async def run():
+            cache = MemoryCache()
+            await cache.save(Name.from_str('/a/b/1'), b'1')
+            assert await cache.search(Name.from_str('/a/b/1'), InterestParam()) == b'1'
+            assert await cache.search(Name.from_str('/a'), InterestParam()) == b'1'
+            assert await cache.search(Name.from_str('/a/c'), InterestParam()) is None
+        aio.run(run())
+
+    @staticmethod
+    def test_lru_eviction():
+        async def run():
+            cache = MemoryCache(capacity=2)
+            await cache.save(Name.from_str('/a/1'), b'1')
+            await cache.save(Name.from_str('/a/2'), b'2')
+            # Touch /a/1 so /a/2 becomes the least recently used
+            assert await cache.search(Name.from_str('/a/1'), InterestParam()) == b'1'
+            await cache.save(Name.from_str('/a/3'), b'3')
+            assert await cache.search(Name.from_str('/a/2'), InterestParam()) is None
+            assert await cache.search(Name.from_str('/a/1'), InterestParam()) == b'1'
+            assert await cache.search(Name.from_str('/a/3'), InterestParam()) == b'3'
+        aio.run(run())
+
+    @staticmethod
+    def test_exact_before_prefix():
+        cache = MemoryCache(capacity=2)
+        cache.save_sync(Name.from_str('/a/b'), b'ab')
+        cache.save_sync(Name.from_str('/a'), b'a')
+        assert cache.search_sync(Name.from_str('/a'), InterestParam()) == b'a'
+        assert cache.search_sync(Name.from_str('/a/b'), InterestParam()) == b'ab'
+        cache.save_sync(Name.from_str('/c'), b'c')
+        # /a was evicted from both indexes, so the prefix search falls back to /a/b
+        assert cache.search_sync(Name.from_str('/a'), InterestParam()) == b'ab'
+
+
+class TestCachedExpress:
+    @staticmethod
+    def test_concurrent_miss_shares_fetch():
+        async def run():
+            root = Node()
+            root.app = FakeApp()
+            root['/a/<x>'] = Node()
+            root.set_policy(policy.Cache, MemoryCachePolicy(MemoryCache()))
+            results = await aio.gather(*(root.match('/a/b').need() for _ in range(3)))
+            assert len(root.app.expressed) == 1
+            assert all(bytes(content) == b'/a/b' for content, _ in results)
+            assert root._pending_fetches == {}
+            # Only the root holds the table
+            assert root['/a/<x>']._pending_fetches is None
+            # Later requests are served by the cache
+            content, _ = await root.match('/a/b').need()
+            assert bytes(content) == b'/a/b'
+            assert len(root.app.expressed) == 1
+        aio.run(run())
+
+    @staticmethod
+    def test_shared_fetch_cancelled_with_last_waiter():
+        class SilentApp(FakeApp):
+            def delay(self, name):
+                return 10
+
+        async def run():
+            root = Node()
+            root.app = SilentApp()
+            root['/a/<x>'] = Node()
+            root.set_policy(policy.Cache, MemoryCachePolicy(MemoryCache()))
+            waiters = [aio.create_task(root.match('/a/b').need()) for _ in range(2)]
+            await aio.sleep(0.01)
+            assert len(root.app.expressed) == 1
+            waiters[0].cancel()
+            await aio.sleep(0.01)
+            # The other caller still waits on the fetch
+            assert root.app.cancelled == 0 and root._pending_fetches
+            waiters[1].cancel()
+            await aio.sleep(0.01)
+            assert root.app.cancelled == 1
+            assert not root._pending_fetches
+        aio.run(run())
+
+    @staticmethod
+    def test_different_lifetime_not_shared():
+        async def run():
+            root = Node()
+            root.app = FakeApp()
+            root['/a/<x>'] = Node()
+            root.set_policy(policy.Cache, MemoryCachePolicy(MemoryCache()))
+            await aio.gather(root.match('/a/b').need(lifetime=4000), root.match('/a/b').need(lifetime=100))
+            assert sorted(param.lifetime for _, param in root.app.expressed) == [100, 4000]
+            assert not root._pending_fetches
+        aio.run(run())
+
+    @staticmethod
+    def test_incoming_interest_hit_and_miss():
+        class Producer(Node):
+            async def process_int(self, match, param, app_param, raw_packet):
+                match.root.app.put_raw_packet(b'produced')
+
+        async def run():
+            root = Node()
+            root.app = FakeApp()
+            root['/a/<x>'] = Producer()
+            cache = MemoryCache()
+            root.set_policy(policy.Cache, MemoryCachePolicy(cache))
+            cache.save_sync(Name.from_str('/a/b'), b'cached')
+            # A hit is answered before the callback returns
+            root._on_interest_root(Name.from_str('/a/b'), InterestParam(), None, b'')
+            assert root.app.sent == [b'cached']
+            # A miss goes through the node's process_int
+            root._on_interest_root(Name.from_str('/a/c'), InterestParam(), None, b'')
+            await aio.sleep(0)
+            assert root.app.sent == [b'cached', b'produced']
+        aio.run(run())
+
+    @staticmethod
+    def test_subclass_overrides_search():
+        class LoggingCache(MemoryCachePolicy):
+            async def search(self, match, name, param):
+                searched.append(Name.to_str(name))
+                return await super().search(match, name, param)
+
+        async def run():
+            root = Node()
+            root.app = FakeApp()
+            root['/a/<x>'] = Node()
+            cache = MemoryCache()
+            root.set_policy(policy.Cache, LoggingCache(cache))
+            cache.save_sync(Name.from_str('/a/b'), b'cached')
+            root._on_interest_root(Name.from_str('/a/b'), InterestParam(), None, b'')
+            await aio.sleep(0)
+            assert searched == ['/a/b']
+            assert root.app.sent == [b'cached']
+
+        # Only the overridden coroutine loses its sync variant
+        assert LoggingCache.search_sync is None
+        assert LoggingCache.save_sync is MemoryCachePolicy.save_sync
+        searched = []
+        aio.run(run())
+
+    @staticmethod
+    def test_wrapped_cache_without_sync_variants():
+        class LoggingMemoryCache(MemoryCache):
+            async def search(self, name, param):
+                searched.append(Name.to_str(name))
+                return await super().search(name, param)
+
+        class AsyncOnly:
+            def __init__(self):
+                self.data = {}
+
+            async def search(self, name, param):
+                searched.append(Name.to_str(name))
+                return self.data.get(Name.to_str(name), None)
+
+            async def save(self, name, packet):
+                self.data[Name.to_str(name)] = bytes(packet)
+
+        async def run(cache):
+            root = Node()
+            root.app = FakeApp()
+            root['/a/<x>'] = Node()
+            cache_policy = MemoryCachePolicy(cache)
+            root.set_policy(policy.Cache, cache_policy)
+            assert cache_policy.search_sync is None
+            await cache_policy.save(None, Name.from_str('/a/b'), b'cached')
+            root._on_interest_root(Name.from_str('/a/b'), InterestParam(), None, b'')
+            await aio.sleep(0)
+            assert searched == ['/a/b']
+            assert root.app.sent == [b'cached']
+
+        searched = []
+        aio.run(run(LoggingMemoryCache()))
+        # The sync save of a MemoryCache subclass is still used, since save() is not overridden
+        assert MemoryCachePolicy(LoggingMemoryCache()).save_sync is not None
+        searched = []
+        aio.run(run(AsyncOnly()))
+        assert MemoryCachePolicy(AsyncOnly()).save_sync is None
+
+    @staticmethod
+    def test_async_save_in_background():
+        class SlowCache(policy.Cache):
+            def __init__(self):
+                super().__init__()
+                self.saved = []
+
+            async def search(self, match, name, param):
+                return None
+
+            async def save(self, match, name, packet):
+                await aio.sleep(0.01)
+                self.saved.append(Name.to_str(name))
+
+        async def run():
+            root = Node()
+            root['/a/<x>'] = Node()
+            cache = SlowCache()
+            root.set_policy(policy.Cache, cache)
+            data = make_data('/a/b', MetaInfo(), b'content', signer=DigestSha256Signer())
+            data_name, meta_info, content, _ = parse_data(data)
+            match = root.match(data_name)
+            content, _ = await match.on_data(meta_info, content, data)
+            assert bytes(content) == b'content'
+            assert cache.saved == []
+            data_name.append(Component.from_str('c'))
+            await root.flush()
+            assert cache.saved == ['/a/b']
+            assert not root._background_tasks
+        aio.run(run())
+
+    @staticmethod
+    def test_async_save_failure_logged(caplog):
+        class BrokenCache(policy.Cache):
+            async def search(self, match, name, param):
+                return None
+
+            async def save(self, match, name, packet):
+                raise OSError('disk full')
+
+        async def run():
+            root = Node()
+            root['/a/<x>'] = Node()
+            root.set_policy(policy.Cache, BrokenCache())
+            data = make_data('/a/b', MetaInfo(), b'content', signer=DigestSha256Signer())
+            data_name, meta_info, content, _ = parse_data(data)
+            await root.match(data_name).on_data(meta_info, content, data)
+            await root.flush()
+
+        aio.run(run())
+        assert 'Background cache save failed' in caplog.text
+        assert 'disk full' in caplog.text
@@ -0,0 +1,66 @@
+# -----------------------------------------------------------------------------
+# Copyright (C) 2019-2024 The python-ndn authors
+#
+# This file is part of python-ndn.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+import asyncio as aio
+import gc
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from ndn.schema.simple_encryption import AesGcmEncryption, ThreadedAesGcmEncryption
+
+
+class TestAesGcmEncryption:
+    @staticmethod
+    def test_round_trip():
+        enc = AesGcmEncryption(bytes(range(16)))
+        cipher_text = enc.encrypt_sync(None, b'Hello, world!')
+        assert len(cipher_text) == 12 + 16 + 13
+        assert enc.decrypt_sync(None, memoryview(cipher_text)) == b'Hello, world!'
+        # A fresh nonce is used for every message
+        assert enc.encrypt_sync(None, b'Hello, world!') != cipher_text
+
+    @staticmethod
+    def test_tampered():
+        enc = AesGcmEncryption(bytes(range(32)))
+        cipher_text = bytearray(enc.encrypt_sync(None, b'Hello, world!'))
+        cipher_text[-1] ^= 1
+        assert enc.decrypt_sync(None, cipher_text) is None
+        assert enc.decrypt_sync(None, b'short') is None
+        assert AesGcmEncryption(bytes(32)).decrypt_sync(None, bytes(cipher_text)) is None
+
+    @staticmethod
+    def test_key_length():
+        with pytest.raises(ValueError):
+            AesGcmEncryption(b'short key')
+
+    @staticmethod
+    def test_executor():
+        async def run():
+            with ThreadPoolExecutor(2) as executor:
+                enc = ThreadedAesGcmEncryption(bytes(range(16)), executor)
+                assert enc.encrypt_sync is None and enc.decrypt_sync is None
+                cipher_texts = await aio.gather(*(enc.encrypt(None, b'%d' % i) for i in range(4)))
+                plain_texts = await aio.gather(*(enc.decrypt(None, c) for c in cipher_texts))
+                assert plain_texts == [b'%d' % i for i in range(4)]
+        aio.run(run())
+
+    @staticmethod
+    def test_no_bound_method_cycle():
+        enc = AesGcmEncryption(bytes(range(16)))
+        # The sync variants are methods, not bound methods stored on the instance
+        assert not any(inspect.ismethod(obj) for obj in gc.get_referents(enc))
+        assert enc.decrypt_sync(None, enc.encrypt_sync(None, b'data')) == b'data'
@@ -0,0 +1,190 @@
+# -----------------------------------------------------------------------------
+# Copyright (C) 2019-2024 The python-ndn authors
+#
+# This file is part of python-ndn.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+import asyncio as aio
+from concurrent.futures import ProcessPoolExecutor
+from Cryptodome.PublicKey import ECC, RSA
+from ndn.encoding import Name, MetaInfo, SignaturePtrs, make_data, parse_data
+from ndn.security import Sha256WithEcdsaSigner, Sha256WithRsaSigner
+from ndn.schema import policy
+from ndn.schema.schema_tree import Node
+from ndn.schema.simple_node import LocalResource
+from ndn.schema.simple_trust import SignedBy, AcceptAll
+
+
+class KeyResource(LocalResource):
+    def __init__(self, parent=None, data=None):
+        super().__init__(parent, data)
+        self.fetched = 0
+
+    async def need(self, match, **kwargs):
+        self.fetched += 1
+        return await super().need(match, **kwargs)
+
+
+def make_tree(pub_key):
+    root = Node()
+    root['/author/<Author>/KEY/<KeyID>'] = KeyResource(data=(pub_key, {}))
+    root['/blog/<Author>/<Post>'] = Node()
+    return root
+
+
+def sign(name, signer, tamper=None):
+    wire = bytearray(make_data(name, MetaInfo(), b'content', signer=signer))
+    if tamper == 'content':
+        wire[wire.index(b'content')] ^= 1
+    elif tamper == 'signature':
+        wire[-1] ^= 1
+    data_name, _, _, sig_ptrs = parse_data(bytes(wire))
+    return data_name, sig_ptrs
+
+
+class TestSignedBy:
+    ecc_key = ECC.generate(curve='P-256')
+    ecc_signer = Sha256WithEcdsaSigner('/author/alice/KEY/1', ecc_key.export_key(format='DER'))
+    ecc_pub = ecc_key.public_key().export_key(format='DER')
+
+    def test_ecdsa(self):
+        async def run():
+            root = make_tree(self.ecc_pub)
+            signed_by = SignedBy(root['/author/<Author>/KEY/<KeyID>'],
+                                 subject_to=lambda data_env, key_env: data_env['Author'] == key_env['Author'])
+            name, sig_ptrs = sign('/blog/alice/p1', self.ecc_signer)
+            assert await signed_by.validate(root.match(name), sig_ptrs)
+            # The key does not belong to the author
+            name, sig_ptrs = sign('/blog/bob/p1', self.ecc_signer)
+            assert not await signed_by.validate(root.match(name), sig_ptrs)
+            for tamper in ('content', 'signature'):
+                name, sig_ptrs = sign('/blog/alice/p2', self.ecc_signer, tamper)
+                assert not await signed_by.validate(root.match(name), sig_ptrs)
+        aio.run(run())
+
+    @staticmethod
+    def test_rsa():
+        async def run():
+            key = RSA.generate(2048)
+            signer = Sha256WithRsaSigner('/author/alice/KEY/1', key.export_key(format='DER'))
+            root = make_tree(key.public_key().export_key(format='DER'))
+            signed_by = SignedBy(root['/author/<Author>/KEY/<KeyID>'])
+            name, sig_ptrs = sign('/blog/alice/p1', signer)
+            assert await signed_by.validate(root.match(name), sig_ptrs)
+            name, sig_ptrs = sign('/blog/alice/p1', signer, 'content')
+            assert not await signed_by.validate(root.match(name), sig_ptrs)
+        aio.run(run())
+
+    def test_malformed_key(self):
+        async def run():
+            root = make_tree(b'not a key')
+            signed_by = SignedBy(root['/author/<Author>/KEY/<KeyID>'])
+            name, sig_ptrs = sign('/blog/alice/p1', self.ecc_signer)
+            assert not await signed_by.validate(root.match(name), sig_ptrs)
+            assert not await signed_by.validate(root.match(name), SignaturePtrs())
+        aio.run(run())
+
+    def test_cache(self):
+        async def run():
+            root = make_tree(self.ecc_pub)
+            key_node = root['/author/<Author>/KEY/<KeyID>']
+            signed_by = SignedBy(key_node)
+            name, sig_ptrs = sign('/blog/alice/p1', self.ecc_signer)
+            assert await signed_by.validate(root.match(name), sig_ptrs)
+            assert await signed_by.validate(root.match(name), sig_ptrs)
+            # The second validation is a cache hit, which does not fetch the key
+            assert key_node.fetched == 1
+            # Failures are not cached
+            bad_name, bad_sig_ptrs = sign('/blog/alice/p2', self.ecc_signer, 'signature')
+            assert not await signed_by.validate(root.match(bad_name), bad_sig_ptrs)
+            assert not await signed_by.validate(root.match(bad_name), bad_sig_ptrs)
+            assert key_node.fetched == 3
+            signed_by.clear_cache()
+            assert await signed_by.validate(root.match(name), sig_ptrs)
+            assert key_node.fetched == 4
+        aio.run(run())
+
+    def test_cache_disabled(self):
+        async def run():
+            root = make_tree(self.ecc_pub)
+            key_node = root['/author/<Author>/KEY/<KeyID>']
+            signed_by = SignedBy(key_node, cache_size=0)
+            name, sig_ptrs = sign('/blog/alice/p1', self.ecc_signer)
+            assert await signed_by.validate(root.match(name), sig_ptrs)
+            assert await signed_by.validate(root.match(name), sig_ptrs)
+            assert key_node.fetched == 2
+        aio.run(run())
+
+    def test_executor(self):
+        async def run():
+            root = make_tree(self.ecc_pub)
+            with ProcessPoolExecutor(1) as executor:
+                signed_by = SignedBy(root['/author/<Author>/KEY/<KeyID>'], cache_size=0, executor=executor)
+                name, sig_ptrs = sign('/blog/alice/p1', self.ecc_signer)
+                assert await signed_by.validate(root.match(name), sig_ptrs)
+                name, sig_ptrs = sign('/blog/alice/p1', self.ecc_signer, 'content')
+                assert not await signed_by.validate(root.match(name), sig_ptrs)
+        aio.run(run())
+
+    def test_get_validator(self):
+        async def run():
+            root = make_tree(self.ecc_pub)
+            signed_by = SignedBy(root['/author/<Author>/KEY/<KeyID>'])
+            root['/blog/<Author>/<Post>'].set_policy(policy.DataValidator, signed_by)
+            name, sig_ptrs = sign('/blog/alice/p1', self.ecc_signer)
+            validator = signed_by.get_validator(root.match(name))
+            assert await validator(name, sig_ptrs)
+        aio.run(run())
+
+
+class TestAcceptAll:
+    @staticmethod
+    def test_accept():
+        async def run():
+            accept_all = AcceptAll()
+            assert accept_all.validate_sync(None, SignaturePtrs())
+            assert await accept_all.validate(None, SignaturePtrs())
+            assert await accept_all.get_validator(None)(Name.from_str('/a'), SignaturePtrs())
+        aio.run(run())
+
+
+class TestValidateBatch:
+    @staticmethod
+    def test_sync():
+        async def run():
+            items = [(None, SignaturePtrs()) for _ in range(3)]
+            assert await AcceptAll().validate_batch(items) == [True, True, True]
+        aio.run(run())
+
+    @staticmethod
+    def test_concurrent():
+        class EvenOnly(policy.InterestValidator):
+            def __init__(self):
+                super().__init__()
+                self.in_flight = 0
+                self.max_in_flight = 0
+
+            async def validate(self, match, sig_ptrs):
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                await aio.sleep(0.01)
+                self.in_flight -= 1
+                return match % 2 == 0
+
+        async def run():
+            validator = EvenOnly()
+            results = await validator.validate_batch([(i, SignaturePtrs()) for i in range(4)])
+            assert results == [True, False, True, False]
+            assert validator.max_in_flight == 4
+        aio.run(run())